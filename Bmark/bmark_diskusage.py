@@ -0,0 +1,174 @@
+# bmark_diskusage.py
+import os
+import json
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+DISK_INDEX_FILE = "bmark_disk_index.json" # Índice persistido por diretório (mtime, arquivos, subpastas)
+TOP_FILES_PER_DIR = 10 # Maiores arquivos guardados por diretório no índice
+# O mtime de uma pasta não muda quando um arquivo dentro dela cresce no lugar (logs, imagens de VM,
+# patches de jogos): entradas mais velhas que isso são relidas mesmo com o mtime igual
+INDEX_MAX_AGE_S = 24 * 3600
+
+
+def _scan_directory(path):
+    """Lista uma única pasta (sem recursão): tamanho dos arquivos, subpastas e maiores arquivos."""
+    files_size = 0
+    file_count = 0
+    subdirs = []
+    top_files = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    size = entry.stat(follow_symlinks=False).st_size
+                    files_size += size
+                    file_count += 1
+                    if len(top_files) < TOP_FILES_PER_DIR:
+                        heapq.heappush(top_files, (size, entry.name))
+                    elif size > top_files[0][0]:
+                        heapq.heapreplace(top_files, (size, entry.name))
+            except OSError:
+                continue
+    return {
+        'files_size': files_size,
+        'file_count': file_count,
+        'subdirs': subdirs,
+        'top_files': sorted(top_files, reverse=True),
+    }
+
+
+class DiskAnalyzer:
+    """Mede o espaço usado por árvores de diretórios com varredura paralela e índice incremental."""
+
+    def __init__(self, index_file=DISK_INDEX_FILE, workers=None, max_age_s=INDEX_MAX_AGE_S):
+        self.index_file = index_file
+        self.max_age_s = max_age_s
+        self.workers = workers or min(32, (os.cpu_count() or 1) * 4) # scandir libera o GIL: threads bastam
+        self.index = self._load_index()
+        self.stats = {}
+
+    def _load_index(self):
+        if not os.path.exists(self.index_file):
+            return {}
+        try:
+            with open(self.index_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = self.index_file + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_file)
+
+    def _visit(self, path, old_dirs, root_dev):
+        """Reaproveita o índice se o mtime da pasta não mudou e a entrada não expirou; senão lista a pasta.
+
+        Pastas em outro dispositivo (/proc, /sys, outros pontos de montagem) são ignoradas.
+        """
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            return None, False
+        if st.st_dev != root_dev:
+            return None, False
+        mtime_ns = st.st_mtime_ns
+        cached = old_dirs.get(path)
+        if (cached is not None and cached['mtime_ns'] == mtime_ns
+                and time.time() - cached.get('scanned_at', 0) < self.max_age_s):
+            return cached, False
+        try:
+            info = _scan_directory(path)
+        except OSError:
+            return None, False
+        info['mtime_ns'] = mtime_ns
+        info['scanned_at'] = time.time()
+        return info, True
+
+    def scan(self, root, full=False):
+        """Varre (ou atualiza) a árvore sob root e persiste o índice. full=True ignora o índice."""
+        root = os.path.abspath(root)
+        started = time.perf_counter()
+        old_dirs = {} if full else self.index.get(root, {}).get('dirs', {})
+        new_dirs = {}
+        rescanned = 0
+        oldest_cached = None
+        try:
+            root_dev = os.stat(root).st_dev # Não sai do volume/partição da raiz
+        except OSError:
+            root_dev = None
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            pending = {executor.submit(self._visit, root, old_dirs, root_dev): root}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = pending.pop(future)
+                    info, was_rescanned = future.result()
+                    if info is None:
+                        continue
+                    new_dirs[path] = info
+                    rescanned += was_rescanned
+                    if not was_rescanned:
+                        oldest_cached = min(oldest_cached or info['scanned_at'], info['scanned_at'])
+                    # Mesmo com a pasta inalterada, as subpastas podem ter mudado: cada uma confere o próprio mtime
+                    for sub in info['subdirs']:
+                        pending[executor.submit(self._visit, sub, old_dirs, root_dev)] = sub
+
+        self.index[root] = {'scanned_at': time.time(), 'dirs': new_dirs}
+        try:
+            self._save_index()
+        except OSError:
+            pass
+        self.stats = {
+            'dirs_total': len(new_dirs),
+            'dirs_rescanned': rescanned,
+            # Pastas vindas do índice: tamanhos de arquivos que cresceram no lugar podem estar desatualizados
+            'dirs_cached': len(new_dirs) - rescanned,
+            'oldest_cached_s': round(time.time() - oldest_cached, 1) if oldest_cached else 0.0,
+            'elapsed_s': round(time.perf_counter() - started, 2),
+        }
+        return self.stats
+
+    def _tree_sizes(self, root):
+        """Tamanho total de cada pasta (arquivos próprios + subpastas), calculado de baixo para cima."""
+        dirs = self.index.get(root, {}).get('dirs', {})
+        totals = {}
+        if root not in dirs:
+            return totals
+        # Pós-ordem iterativa a partir da raiz: um pai só é somado depois de todos os filhos
+        stack = [(root, False)]
+        while stack:
+            path, children_done = stack.pop()
+            info = dirs[path]
+            if children_done:
+                totals[path] = info['files_size'] + sum(totals.get(sub, 0) for sub in info['subdirs'])
+                continue
+            stack.append((path, True))
+            stack.extend((sub, False) for sub in info['subdirs'] if sub in dirs and sub not in totals)
+        return totals
+
+    def get_report(self, root, limit=15):
+        """Resumo: tamanho total, maiores pastas e maiores arquivos a partir do índice."""
+        root = os.path.abspath(root)
+        if root not in self.index:
+            self.scan(root)
+        dirs = self.index[root]['dirs']
+        totals = self._tree_sizes(root)
+
+        largest_files = heapq.nlargest(
+            limit,
+            ((size, os.path.join(path, name)) for path, info in dirs.items() for size, name in info['top_files']))
+        largest_dirs = heapq.nlargest(limit, ((size, path) for path, size in totals.items() if path != root))
+        return {
+            'root': root,
+            'total_bytes': totals.get(root, 0),
+            'file_count': sum(info['file_count'] for info in dirs.values()),
+            'largest_dirs': largest_dirs,
+            'largest_files': largest_files,
+        }
@@ -0,0 +1,224 @@
+# bmark_duplicates.py
+import os
+import mmap
+import sqlite3
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+HASH_CACHE_FILE = "bmark_hash_cache.db" # Cache de hashes por (caminho, tamanho, mtime)
+PARTIAL_BLOCK = 64 * 1024 # Bytes lidos do início e do fim no hash parcial
+READ_BUFFER = 4 * 1024 * 1024 # Buffer de leitura quando mmap não está disponível
+MMAP_MIN_SIZE = 16 * 1024 * 1024 # Acima disso o hash completo usa mmap
+POOL_MIN_FILES = 32 # Abaixo disso não compensa subir o pool de processos
+
+
+def _partial_hash(path, size):
+    """Hash do início + fim do arquivo (o arquivo inteiro se for pequeno)."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        if size <= 2 * PARTIAL_BLOCK:
+            h.update(f.read())
+        else:
+            h.update(f.read(PARTIAL_BLOCK))
+            f.seek(-PARTIAL_BLOCK, os.SEEK_END)
+            h.update(f.read(PARTIAL_BLOCK))
+    return h.hexdigest()
+
+
+def _full_hash(path, size):
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        if size >= MMAP_MIN_SIZE:
+            try:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for offset in range(0, size, READ_BUFFER):
+                        h.update(mm[offset:offset + READ_BUFFER])
+                return h.hexdigest()
+            except (OSError, ValueError):
+                f.seek(0)
+                h = hashlib.blake2b(digest_size=20)
+        buf = bytearray(READ_BUFFER)
+        view = memoryview(buf)
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            h.update(view[:n])
+    return h.hexdigest()
+
+
+def _hash_job(job):
+    """Executado no pool de processos: (kind, path, size) -> (path, digest ou None)."""
+    kind, path, size = job
+    try:
+        if kind == 'partial':
+            return path, _partial_hash(path, size)
+        return path, _full_hash(path, size)
+    except OSError:
+        return path, None
+
+
+class DuplicateFinder:
+    """Localiza arquivos duplicados em 3 etapas: tamanho -> hash parcial -> hash completo."""
+
+    def __init__(self, cache_file=HASH_CACHE_FILE, workers=None, min_size=1):
+        self.cache_file = cache_file
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.min_size = min_size
+        self.stats = {}
+
+    # --- CACHE ---
+
+    def _open_cache(self):
+        conn = sqlite3.connect(self.cache_file)
+        conn.execute("CREATE TABLE IF NOT EXISTS hashes (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, partial TEXT, full TEXT)")
+        return conn
+
+    def _load_cached(self, conn, entries):
+        """Retorna {path: (partial, full)} para entradas cujo tamanho e mtime não mudaram."""
+        cached = {}
+        for path, size, mtime_ns in entries:
+            row = conn.execute("SELECT size, mtime_ns, partial, full FROM hashes WHERE path = ?", (path,)).fetchone()
+            if row and row[0] == size and row[1] == mtime_ns:
+                cached[path] = (row[2], row[3])
+        return cached
+
+    def _store(self, conn, meta, column, digests):
+        conn.executemany(
+            "INSERT INTO hashes (path, size, mtime_ns, partial, full) VALUES (?, ?, ?, NULL, NULL) "
+            "ON CONFLICT(path) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns, "
+            "partial = CASE WHEN hashes.size = excluded.size AND hashes.mtime_ns = excluded.mtime_ns THEN hashes.partial END, "
+            "full = CASE WHEN hashes.size = excluded.size AND hashes.mtime_ns = excluded.mtime_ns THEN hashes.full END",
+            [(path, meta[path][0], meta[path][1]) for path in digests])
+        conn.executemany(f"UPDATE hashes SET {column} = ? WHERE path = ?", [(d, p) for p, d in digests.items()])
+        conn.commit()
+
+    # --- VARREDURA ---
+
+    def _scan(self, root):
+        """Lista (caminho, tamanho, mtime_ns, (st_dev, st_ino)) de todos os arquivos regulares sob root.
+
+        A chave de inode é None quando o DirEntry não a informa (Windows): é obtida depois, só para candidatos.
+        """
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                stack.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                st = entry.stat(follow_symlinks=False)
+                                if st.st_size >= self.min_size:
+                                    key = (st.st_dev, st.st_ino) if st.st_ino else None
+                                    yield entry.path, st.st_size, st.st_mtime_ns, key
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+
+    def _inode_key(self, path, key):
+        if key is not None:
+            return key
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino) if st.st_ino else None
+
+    def _unique_inodes(self, group, keys, links):
+        """Mantém um caminho por inode: hard links apontam para os mesmos dados e não liberam espaço."""
+        seen = {}
+        unique = []
+        for path in sorted(group):
+            key = self._inode_key(path, keys[path])
+            if key is not None and key in seen:
+                links[seen[key]].append(path)
+                continue
+            if key is not None:
+                seen[key] = path
+            unique.append(path)
+        return unique
+
+    def _hash_many(self, kind, items, executor):
+        jobs = [(kind, path, size) for path, size in items]
+        if executor is None:
+            results = map(_hash_job, jobs)
+        else:
+            results = executor.map(_hash_job, jobs, chunksize=max(1, len(jobs) // (self.workers * 4)))
+        return {path: digest for path, digest in results if digest is not None}
+
+    def _refine(self, groups, kind, meta, cached, conn, executor):
+        """Subdivide cada grupo pelo hash `kind`, reutilizando o cache quando possível."""
+        slot = 0 if kind == 'partial' else 1
+        digests, to_hash = {}, []
+        for group in groups:
+            for path in group:
+                cached_digest = cached.get(path, (None, None))[slot]
+                if cached_digest:
+                    digests[path] = cached_digest
+                else:
+                    to_hash.append((path, meta[path][0]))
+        fresh = self._hash_many(kind, to_hash, executor)
+        if fresh:
+            self._store(conn, meta, kind, fresh)
+        digests.update(fresh)
+        self.stats[f'{kind}_hashed'] = len(to_hash)
+        self.stats[f'{kind}_cached'] = sum(len(g) for g in groups) - len(to_hash)
+
+        refined = []
+        for group in groups:
+            by_digest = defaultdict(list)
+            for path in group:
+                if path in digests:
+                    by_digest[(meta[path][0], digests[path])].append(path)
+            refined.extend(g for g in by_digest.values() if len(g) > 1)
+        return refined
+
+    def find_duplicates(self, root):
+        """Retorna lista de grupos {size, paths, reclaimable, hardlinks} ordenada por bytes recuperáveis.
+
+        `paths` tem um caminho por inode; os demais nomes do mesmo inode ficam em `hardlinks`.
+        """
+        meta, keys = {}, {}
+        by_size = defaultdict(list)
+        for path, size, mtime_ns, key in self._scan(root):
+            meta[path] = (size, mtime_ns)
+            keys[path] = key
+            by_size[size].append(path)
+        links = defaultdict(list) # caminho mantido -> outros nomes (hard links) do mesmo inode
+        groups = [self._unique_inodes(g, keys, links) for g in by_size.values() if len(g) > 1]
+        groups = [g for g in groups if len(g) > 1]
+        self.stats = {'files_scanned': len(meta), 'size_candidates': sum(len(g) for g in groups),
+                      'hardlinks_skipped': sum(len(v) for v in links.values())}
+
+        conn = self._open_cache()
+        try:
+            cached = self._load_cached(conn, [(p, *meta[p]) for g in groups for p in g])
+            executor = None
+            if self.stats['size_candidates'] >= POOL_MIN_FILES and self.workers > 1:
+                executor = ProcessPoolExecutor(max_workers=self.workers)
+            try:
+                groups = self._refine(groups, 'partial', meta, cached, conn, executor)
+                # Arquivos pequenos já foram lidos inteiros no hash parcial
+                small = [g for g in groups if meta[g[0]][0] <= 2 * PARTIAL_BLOCK]
+                large = [g for g in groups if meta[g[0]][0] > 2 * PARTIAL_BLOCK]
+                groups = small + self._refine(large, 'full', meta, cached, conn, executor)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+        finally:
+            conn.close()
+
+        result = []
+        for paths in groups:
+            size = meta[paths[0]][0]
+            # Um caminho por inode: o recuperável conta só cópias físicas distintas
+            result.append({'size': size, 'paths': sorted(paths), 'reclaimable': size * (len(paths) - 1),
+                           'hardlinks': {p: links[p] for p in sorted(paths) if links.get(p)}})
+        result.sort(key=lambda g: g['reclaimable'], reverse=True)
+        self.stats['reclaimable_bytes'] = sum(g['reclaimable'] for g in result)
+        return result
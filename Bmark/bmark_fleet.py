@@ -0,0 +1,395 @@
+# bmark_fleet.py
+import os
+import json
+import zlib
+import time
+import glob
+import hmac
+import socket
+import struct
+import threading
+import socketserver
+from collections import deque
+
+from bmark_sysmon import SystemMonitor
+
+DEFAULT_FLEET_PORT = 9750
+DEFAULT_COLLECTOR_HOST = "127.0.0.1" # Só local por padrão: expor na rede é escolha explícita (com token)
+FLEET_TOKEN_ENV = "BMARK_FLEET_TOKEN" # Segredo compartilhado entre agentes e coletor
+SPOOL_DIR = "bmark_spool" # Buffer em disco enquanto o coletor está inacessível
+MAX_SPOOL_FILES = 500 # Limite de lotes guardados em disco (os mais antigos são descartados)
+FRAME_HEADER = struct.Struct("!I") # Tamanho do payload comprimido (big-endian)
+MAX_FRAME_BYTES = 16 * 1024 * 1024
+MAX_DECODED_BYTES = 64 * 1024 * 1024 # Limite após descomprimir (evita "zip bomb" no coletor)
+ACK = b"\x06"
+NAK = b"\x15" # Frame recebido mas ilegível: o agente deve descartar/isolar o lote
+AUTH_FAIL = b"\x18" # Token ausente ou errado: o agente mantém o lote no buffer
+MAX_BENCHMARKS_PER_HOST = 1000
+
+
+def _encode_batch(batch):
+    """Serializa e comprime um lote para envio."""
+    return zlib.compress(json.dumps(batch, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _decode_batch(payload):
+    """Descomprime com limite de tamanho; ValueError se o lote for inválido ou grande demais."""
+    decompressor = zlib.decompressobj()
+    data = decompressor.decompress(payload, MAX_DECODED_BYTES)
+    if decompressor.unconsumed_tail:
+        raise ValueError(f"Lote excede {MAX_DECODED_BYTES} bytes descomprimido.")
+    if not decompressor.eof:
+        raise ValueError("Lote truncado.")
+    batch = json.loads(data.decode("utf-8"))
+    if not isinstance(batch, dict):
+        raise ValueError("Lote em formato inesperado.")
+    return batch
+
+
+def parse_addr(value, default_host):
+    """Converte 'host:porta', 'porta' ou 'host' em (host, porta). ValueError se a porta for inválida."""
+    if not value:
+        return default_host, DEFAULT_FLEET_PORT
+    host, sep, port = value.rpartition(":")
+    if not sep and not port.isdigit():
+        return port, DEFAULT_FLEET_PORT # Só o host: usa a porta padrão
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"Porta inválida em '{value}'. Use host:porta.")
+    return host or default_host, int(port)
+
+
+def _recv_exact(sock, size):
+    buf = bytearray()
+    while len(buf) < size:
+        chunk = sock.recv(size - len(buf))
+        if not chunk:
+            raise ConnectionError("Conexão encerrada pelo par.")
+        buf.extend(chunk)
+    return bytes(buf)
+
+
+def _percentile(sorted_values, pct):
+    """Percentil com interpolação linear sobre uma lista já ordenada."""
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * (pct / 100.0)
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class FleetAgent:
+    """Agrupa amostras do SystemMonitor e resultados de benchmark e envia ao coletor."""
+
+    def __init__(self, collector_host, collector_port=DEFAULT_FLEET_PORT, sys_monitor=None,
+                 hostname=None, batch_size=20, max_pending=200, spool_dir=SPOOL_DIR, timeout=5.0, token=None):
+        self.collector_addr = (collector_host, collector_port)
+        self.sys_monitor = sys_monitor or SystemMonitor()
+        self.hostname = hostname or socket.gethostname()
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.spool_dir = spool_dir
+        self.timeout = timeout
+        self.token = token
+
+        self.pending = deque()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.sock = None
+        self.profile_sent = False
+        self.spool_seq = 0
+
+    # --- COLETA ---
+
+    def add_sample(self, data=None):
+        """Enfileira uma amostra de get_overview_data (coletada agora se não informada)."""
+        if data is None:
+            data = self.sys_monitor.get_overview_data()
+        self._enqueue({'type': 'sample', 'ts': time.time(), 'data': data})
+
+    def add_benchmark(self, metrics, label="benchmark"):
+        """Enfileira um resultado de benchmark (ex.: measure_latency_metrics)."""
+        self._enqueue({'type': 'benchmark', 'ts': time.time(), 'label': label, 'data': metrics})
+
+    def _enqueue(self, record):
+        with self.lock:
+            self.pending.append(record)
+            overflow = len(self.pending) >= self.max_pending
+        # Back-pressure: se o coletor não está drenando, move a fila para o disco
+        if overflow:
+            self._spool_pending()
+
+    # --- TRANSPORTE ---
+
+    def _connect(self):
+        if self.sock is None:
+            self.sock = socket.create_connection(self.collector_addr, timeout=self.timeout)
+        return self.sock
+
+    def _disconnect(self):
+        if self.sock is not None:
+            try: self.sock.close()
+            except OSError: pass
+            self.sock = None
+
+    def _send_payload(self, payload):
+        """Envia um frame e aguarda o ACK do coletor antes de liberar o próximo (stop-and-wait).
+
+        Retorna False se o coletor recusou o lote (NAK): reenviar não adianta.
+        """
+        if len(payload) > MAX_FRAME_BYTES:
+            return False
+        sock = self._connect()
+        sock.sendall(FRAME_HEADER.pack(len(payload)) + payload)
+        reply = _recv_exact(sock, 1)
+        if reply == NAK:
+            return False
+        if reply == AUTH_FAIL:
+            raise PermissionError("Token recusado pelo coletor.")
+        if reply != ACK:
+            raise ConnectionError("ACK inválido do coletor.")
+        return True
+
+    def _take_batch(self):
+        with self.lock:
+            records = [self.pending.popleft() for _ in range(min(self.batch_size, len(self.pending)))]
+        if not records:
+            return None, records
+        batch = {'host': self.hostname, 'records': records}
+        if self.token:
+            batch['token'] = self.token
+        if not self.profile_sent:
+            batch['profile'] = self.sys_monitor.get_hardware_profile()
+        return batch, records
+
+    def _spool_pending(self):
+        """Grava os registros pendentes no disco, um arquivo por lote."""
+        while True:
+            batch, records = self._take_batch()
+            if batch is None:
+                break
+            self._write_spool(_encode_batch(batch))
+
+    def _write_spool(self, payload):
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self.spool_seq += 1
+        path = os.path.join(self.spool_dir, f"batch_{time.time_ns()}_{self.spool_seq:06d}.bmk")
+        # Grava em arquivo temporário e renomeia: uma queda no meio não deixa lote parcial no buffer
+        with open(path + ".tmp", 'wb') as f:
+            f.write(payload)
+        os.replace(path + ".tmp", path)
+        spooled = self._spool_files()
+        for old in spooled[:max(0, len(spooled) - MAX_SPOOL_FILES)]:
+            try: os.remove(old)
+            except OSError: pass
+
+    def _spool_files(self):
+        return sorted(glob.glob(os.path.join(self.spool_dir, "batch_*.bmk")))
+
+    def _quarantine(self, path):
+        """Move um lote recusado pelo coletor para fora do buffer (fica em .bad para inspeção)."""
+        try: os.replace(path, path[:-len(".bmk")] + ".bad")
+        except OSError: pass
+
+    def _drain_spool(self):
+        drained = rejected = 0
+        for path in self._spool_files():
+            with open(path, 'rb') as f:
+                payload = f.read()
+            if self._send_payload(payload):
+                os.remove(path)
+                drained += 1
+            else:
+                self._quarantine(path)
+                rejected += 1
+        return drained, rejected
+
+    def flush(self):
+        """Envia o buffer em disco e a fila em memória. Em falha, tudo vai para o disco."""
+        sent = 0
+        try:
+            drained, rejected = self._drain_spool()
+            while True:
+                batch, records = self._take_batch()
+                if batch is None:
+                    break
+                payload = _encode_batch(batch)
+                try:
+                    accepted = self._send_payload(payload)
+                except (OSError, ConnectionError):
+                    self._write_spool(payload)
+                    raise
+                if not accepted:
+                    rejected += 1
+                    continue
+                if 'profile' in batch:
+                    self.profile_sent = True
+                sent += len(records)
+            message = f"{sent} registros e {drained} lotes do buffer enviados ao coletor."
+            if rejected:
+                message += f" {rejected} lote(s) recusado(s) pelo coletor (isolados como .bad)."
+            return True, message
+        except (OSError, ConnectionError) as e:
+            self._disconnect()
+            self._spool_pending()
+            return False, f"Coletor inacessível ({e}). Dados mantidos em '{self.spool_dir}'."
+
+    # --- LOOP EM SEGUNDO PLANO ---
+
+    def start(self, interval=3.0, flush_every=10):
+        """Inicia a coleta periódica de amostras com envio a cada `flush_every` amostras."""
+        def _loop():
+            count = 0
+            while not self.stop_event.is_set():
+                try:
+                    self.add_sample()
+                    count += 1
+                    if count % flush_every == 0:
+                        self.flush()
+                except Exception as e:
+                    print(f"Erro no agente BMark: {e}")
+                self.stop_event.wait(interval)
+            self.flush()
+
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=self.timeout * 2)
+        self._disconnect()
+
+
+class _CollectorHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        collector = self.server.collector
+        while True:
+            try:
+                (size,) = FRAME_HEADER.unpack(_recv_exact(self.request, FRAME_HEADER.size))
+                if size > MAX_FRAME_BYTES:
+                    self.request.sendall(NAK) # Não dá para pular o frame: recusa e encerra
+                    return
+                payload = _recv_exact(self.request, size)
+            except (ConnectionError, OSError):
+                return
+            try:
+                batch = _decode_batch(payload)
+            except (ValueError, zlib.error):
+                # Frame completo porém ilegível: recusa só este lote e segue na mesma conexão
+                self.request.sendall(NAK)
+                continue
+            if not collector.check_token(batch.pop('token', None)):
+                self.request.sendall(AUTH_FAIL)
+                return
+            collector.ingest(batch, peer=self.client_address[0])
+            # O ACK só sai depois da agregação: o agente não envia mais rápido do que processamos
+            self.request.sendall(ACK)
+
+
+class _CollectorServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class FleetCollector:
+    """Recebe lotes dos agentes e agrega dados por máquina e percentis da frota."""
+
+    def __init__(self, host=DEFAULT_COLLECTOR_HOST, port=DEFAULT_FLEET_PORT, max_samples_per_host=5000,
+                 max_benchmarks_per_host=MAX_BENCHMARKS_PER_HOST, token=None):
+        self.host = host
+        self.port = port
+        self.max_samples_per_host = max_samples_per_host
+        self.max_benchmarks_per_host = max_benchmarks_per_host
+        self.token = token
+        self.hosts = {}
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+
+    def start(self):
+        self.server = _CollectorServer((self.host, self.port), _CollectorHandler)
+        self.server.collector = self
+        self.port = self.server.server_address[1] # Resolve a porta quando port=0
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self.port
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def check_token(self, token):
+        """Sem token configurado aceita tudo; com token, exige o mesmo valor (comparação em tempo constante)."""
+        if not self.token:
+            return True
+        return isinstance(token, str) and hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def ingest(self, batch, peer=None):
+        host = str(batch.get('host') or peer or "desconhecido")
+        with self.lock:
+            entry = self.hosts.setdefault(host, {
+                'profile': None,
+                'last_seen': None,
+                'samples': deque(maxlen=self.max_samples_per_host),
+                'benchmarks': deque(maxlen=self.max_benchmarks_per_host),
+            })
+            if batch.get('profile'):
+                entry['profile'] = batch['profile']
+            for record in batch.get('records', []):
+                if not isinstance(record, dict) or not isinstance(record.get('data'), dict):
+                    continue
+                if record.get('type') == 'sample':
+                    entry['samples'].append(record)
+                elif record.get('type') == 'benchmark':
+                    entry['benchmarks'].append(record)
+            entry['last_seen'] = time.time()
+
+    def _numeric_values(self, records, metric):
+        values = []
+        for record in records:
+            value = record['data'].get(metric)
+            if isinstance(value, (int, float)):
+                values.append(float(value))
+        return values
+
+    def get_hosts(self):
+        with self.lock:
+            return sorted(self.hosts)
+
+    def get_host_summary(self, host, metrics=('cpu_percent', 'ram_percent', 'disk_percent')):
+        """Resumo de uma máquina: perfil, contagens e média/p95 de cada métrica."""
+        with self.lock:
+            entry = self.hosts.get(host)
+            if entry is None:
+                return None
+            samples = list(entry['samples'])
+            summary = {
+                'profile': entry['profile'],
+                'last_seen': entry['last_seen'],
+                'sample_count': len(samples),
+                'benchmark_count': len(entry['benchmarks']),
+                'last_benchmark': entry['benchmarks'][-1] if entry['benchmarks'] else None,
+            }
+        for metric in metrics:
+            values = sorted(self._numeric_values(samples, metric))
+            summary[metric] = {
+                'avg': sum(values) / len(values) if values else None,
+                'p95': _percentile(values, 95),
+            }
+        return summary
+
+    def get_fleet_percentiles(self, metric, percentiles=(50, 90, 99), source='sample'):
+        """Percentis de uma métrica sobre todas as máquinas (amostras ou benchmarks)."""
+        values = []
+        with self.lock:
+            for entry in self.hosts.values():
+                records = entry['samples'] if source == 'sample' else entry['benchmarks']
+                values.extend(self._numeric_values(records, metric))
+        values.sort()
+        return {f"p{p}": _percentile(values, p) for p in percentiles}
@@ -0,0 +1,146 @@
+# bmark_frametime.py
+import os
+import numpy as np
+
+# Colunas de frame time aceitas, na ordem de preferência (PresentMon 1.x / 2.x e similares)
+FRAMETIME_COLUMNS = ["MsBetweenPresents", "msBetweenPresents", "FrameTime", "frametime", "MsBetweenDisplayChange"]
+CHUNK_LINES = 200_000 # Linhas por bloco: mantém a memória limitada em capturas de vários GB
+HIST_RESOLUTION_MS = 0.01 # Resolução do histograma usado para os percentis
+HIST_MAX_MS = 1000.0 # Frames acima disso caem no último bin
+STUTTER_WINDOW = 30 # Frames usados na média móvel de referência
+STUTTER_FACTOR = 2.0 # Stutter = frame time > fator x média móvel dos frames anteriores
+STUTTER_MIN_MS = 8.0 # Ignora "picos" abaixo disso (ex.: 2 ms -> 4 ms em 500 FPS)
+
+
+class FrameTimeAnalyzer:
+    """Estatísticas de frame time a partir de capturas CSV no estilo PresentMon."""
+
+    def __init__(self, chunk_lines=CHUNK_LINES, stutter_factor=STUTTER_FACTOR,
+                 stutter_window=STUTTER_WINDOW, stutter_min_ms=STUTTER_MIN_MS):
+        self.chunk_lines = chunk_lines
+        self.stutter_factor = stutter_factor
+        self.stutter_window = stutter_window
+        self.stutter_min_ms = stutter_min_ms
+
+    # --- LEITURA EM BLOCOS ---
+
+    def _find_column(self, header):
+        names = [h.strip().strip('"') for h in header.split(",")]
+        for candidate in FRAMETIME_COLUMNS:
+            if candidate in names:
+                return names.index(candidate), candidate
+        raise ValueError(f"Nenhuma coluna de frame time encontrada ({', '.join(FRAMETIME_COLUMNS)}).")
+
+    def _parse_chunk(self, lines, col_idx):
+        try:
+            values = np.loadtxt(lines, delimiter=",", usecols=col_idx, dtype=np.float64, ndmin=1)
+        except ValueError:
+            # Linhas com "NA" ou campos faltando: converte uma a uma e descarta as inválidas
+            parsed = []
+            for line in lines:
+                fields = line.split(",")
+                try: parsed.append(float(fields[col_idx]))
+                except (IndexError, ValueError): continue
+            values = np.asarray(parsed, dtype=np.float64)
+        return values[np.isfinite(values) & (values > 0)]
+
+    def iter_frame_times(self, csv_path):
+        """Gera arrays NumPy de frame times (ms), um por bloco de linhas do CSV."""
+        with open(csv_path, "r", encoding="utf-8", errors="replace") as f:
+            header = f.readline()
+            col_idx, _ = self._find_column(header)
+            lines = []
+            for line in f:
+                if line.strip():
+                    lines.append(line)
+                if len(lines) >= self.chunk_lines:
+                    yield self._parse_chunk(lines, col_idx)
+                    lines = []
+            if lines:
+                yield self._parse_chunk(lines, col_idx)
+
+    # --- ANÁLISE ---
+
+    def _count_stutters(self, frame_times, history):
+        """Conta frames acima de fator x média móvel dos `window` frames anteriores (vetorizado)."""
+        window = self.stutter_window
+        data = np.concatenate((history, frame_times))
+        if len(data) <= window:
+            return 0, data
+        csum = np.cumsum(np.concatenate(([0.0], data)))
+        # Média dos `window` frames imediatamente anteriores a cada frame i >= window
+        prev_mean = (csum[window:-1] - csum[:-window - 1]) / window
+        current = data[window:]
+        # Só conta frames que pertencem ao bloco atual (o histórico já foi avaliado)
+        start = max(0, len(history) - window)
+        mask = (current > self.stutter_factor * prev_mean) & (current >= self.stutter_min_ms)
+        return int(np.count_nonzero(mask[start:])), data[-window:]
+
+    def analyze_capture(self, csv_path):
+        """Processa a captura em blocos e retorna FPS médio, lows, variância e stutters."""
+        if not os.path.isfile(csv_path):
+            raise FileNotFoundError(f"Captura '{csv_path}' não encontrada.")
+
+        n_bins = int(HIST_MAX_MS / HIST_RESOLUTION_MS) + 1
+        histogram = np.zeros(n_bins, dtype=np.int64)
+        count, total, mean, m2 = 0, 0.0, 0.0, 0.0
+        max_ft = 0.0
+        stutters = 0
+        history = np.empty(0, dtype=np.float64)
+
+        for chunk in self.iter_frame_times(csv_path):
+            if chunk.size == 0:
+                continue
+            bins = np.minimum((chunk / HIST_RESOLUTION_MS).astype(np.int64), n_bins - 1)
+            histogram += np.bincount(bins, minlength=n_bins)
+
+            # Combinação de variâncias por bloco (Chan et al.) para não guardar a captura inteira
+            c_count = chunk.size
+            c_mean = float(chunk.mean())
+            c_m2 = float(((chunk - c_mean) ** 2).sum())
+            delta = c_mean - mean
+            new_count = count + c_count
+            mean += delta * c_count / new_count
+            m2 += c_m2 + delta ** 2 * count * c_count / new_count
+            count = new_count
+            total += float(chunk.sum())
+            max_ft = max(max_ft, float(chunk.max()))
+
+            found, history = self._count_stutters(chunk, history)
+            stutters += found
+
+        if count == 0:
+            raise ValueError(f"A captura '{csv_path}' não contém frames válidos.")
+
+        cumulative = np.cumsum(histogram)
+
+        def pct_ms(pct):
+            idx = int(np.searchsorted(cumulative, np.ceil(count * pct / 100.0)))
+            return (idx + 0.5) * HIST_RESOLUTION_MS
+
+        p99, p999 = pct_ms(99), pct_ms(99.9)
+        return {
+            'frames': count,
+            'duration_s': round(total / 1000.0, 2),
+            'avg_fps': round(count / (total / 1000.0), 1),
+            'avg_frame_time_ms': round(mean, 3),
+            'p50_frame_time_ms': round(pct_ms(50), 2),
+            'p99_frame_time_ms': round(p99, 2),
+            'p999_frame_time_ms': round(p999, 2),
+            '1pct_low_fps': round(1000.0 / p99, 1),
+            '0.1pct_low_fps': round(1000.0 / p999, 1),
+            'max_frame_time_ms': round(max_ft, 2),
+            'frame_time_variance': round(m2 / count, 4),
+            'stutter_count': stutters,
+        }
+
+    def compare_captures(self, before_csv, after_csv):
+        """Analisa duas capturas e calcula a variação percentual de cada métrica."""
+        before = self.analyze_capture(before_csv)
+        after = self.analyze_capture(after_csv)
+        delta = {}
+        for key, after_value in after.items():
+            before_value = before.get(key)
+            if before_value:
+                delta[key] = round((after_value - before_value) / before_value * 100.0, 1)
+        return {'before': before, 'after': after, 'delta_percent': delta}
@@ -0,0 +1,224 @@
+# bmark_gamemode.py
+import os
+import atexit
+import fnmatch
+import platform
+import threading
+import psutil
+
+from bmark_sysmon import PROTECTED_PROCESSES
+
+IS_WINDOWS = platform.system() == "Windows"
+# Prioridades por plataforma: classes de prioridade no Windows, valores de nice nos demais
+GAME_PRIORITY = psutil.HIGH_PRIORITY_CLASS if IS_WINDOWS else -5
+BACKGROUND_PRIORITY = psutil.BELOW_NORMAL_PRIORITY_CLASS if IS_WINDOWS else 10
+BACKGROUND_IOPRIO = getattr(psutil, "IOPRIO_VERYLOW", None) if IS_WINDOWS else getattr(psutil, "IOPRIO_CLASS_IDLE", None)
+SCAN_INTERVAL_S = 2.0
+CAP_SYS_NICE = 23 # Bit da capability em /proc/<pid>/status (CapEff)
+RESTORE_LABELS = {'nice': "prioridade", 'affinity': "afinidade", 'ionice': "prioridade de I/O"}
+
+# Padrões (glob, minúsculos) de processos de segundo plano rebaixados por padrão
+DEFAULT_BACKGROUND_RULES = [
+    "onedrive*", "*update*", "steamwebhelper*", "epicwebhelper*", "msedgewebview2*",
+    "searchindexer*", "searchapp*", "tracker-miner*", "baloo*", "dropbox*", "googledrivesync*",
+]
+
+
+def _nice_floor():
+    """Menor nice que este processo consegue definir (Linux/macOS).
+
+    root ou CAP_SYS_NICE: -20. Usuário comum: 20 - RLIMIT_NICE (com o limite padrão 0, nenhum
+    nice pode ser diminuído, ou seja, um processo rebaixado não volta ao nice original).
+    """
+    if os.geteuid() == 0:
+        return -20
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("CapEff:") and int(line.split()[1], 16) & (1 << CAP_SYS_NICE):
+                    return -20
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NICE)
+    except (ImportError, AttributeError, ValueError, OSError):
+        return 20
+    if soft == resource.RLIM_INFINITY:
+        return -20
+    return 20 - soft
+
+
+class GameModeManager:
+    """Prioriza o processo do jogo (prioridade + afinidade) e rebaixa processos de segundo plano."""
+
+    def __init__(self, background_rules=None, interval=SCAN_INTERVAL_S):
+        self.background_rules = [r.lower() for r in (background_rules or DEFAULT_BACKGROUND_RULES)]
+        self.interval = interval
+        self.target = None
+        self.game_cores = None
+        self.background_cores = None
+        # pid -> {'create_time', 'role', 'name', 'changes': {atributo alterado: valor original}}
+        self.originals = {}
+        self.known_pids = set()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.active = False
+        atexit.register(self.deactivate)
+
+    # --- SELEÇÃO ---
+
+    def _matches_target(self, proc):
+        if isinstance(self.target, int):
+            return proc.pid == self.target
+        return fnmatch.fnmatch(proc.name().lower(), self.target)
+
+    def _matches_background(self, proc):
+        name = proc.name().lower()
+        if name in PROTECTED_PROCESSES or proc.pid == os.getpid():
+            return False
+        return any(fnmatch.fnmatch(name, rule) for rule in self.background_rules)
+
+    # --- APLICAÇÃO / REVERSÃO ---
+
+    def _apply(self, proc):
+        """Aplica as regras a um processo; retorna o papel aplicado ('game'/'background') ou None.
+
+        Só os atributos realmente alterados são guardados em `originals` para a reversão.
+        """
+        try:
+            if proc.pid in self.originals:
+                return None
+            if self._matches_target(proc):
+                role, priority, cores = 'game', GAME_PRIORITY, self.game_cores
+            elif self._matches_background(proc):
+                role, priority, cores = 'background', BACKGROUND_PRIORITY, self.background_cores
+            else:
+                return None
+            create_time, name = proc.create_time(), proc.name()
+            changes = {}
+            original_nice = proc.nice()
+            # Rebaixar só se der para voltar: sem privilégio, o Linux não deixa diminuir o nice de novo
+            if IS_WINDOWS or role == 'game' or original_nice >= _nice_floor():
+                try:
+                    proc.nice(priority)
+                    changes['nice'] = original_nice
+                except psutil.AccessDenied: pass # Ex.: aumentar prioridade sem CAP_SYS_NICE no Linux
+            if cores and hasattr(proc, "cpu_affinity"):
+                try:
+                    original_affinity = proc.cpu_affinity()
+                    proc.cpu_affinity(cores)
+                    changes['affinity'] = original_affinity
+                except psutil.AccessDenied: pass
+            if role == 'background' and BACKGROUND_IOPRIO is not None and hasattr(proc, "ionice"):
+                try:
+                    original_ionice = proc.ionice()
+                    proc.ionice(BACKGROUND_IOPRIO)
+                    changes['ionice'] = original_ionice
+                except psutil.AccessDenied: pass
+            if not changes:
+                return None # Nada foi aplicado: não há o que reverter
+            self.originals[proc.pid] = {'create_time': create_time, 'role': role, 'name': name, 'changes': changes}
+            return role
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return None
+
+    def _restore(self, pid):
+        """Reverte cada atributo separadamente; retorna a lista dos que não puderam ser revertidos."""
+        original = self.originals.pop(pid)
+        try:
+            proc = psutil.Process(pid)
+            if proc.create_time() != original['create_time']:
+                return [] # PID reutilizado por outro processo: o original já terminou
+        except psutil.NoSuchProcess:
+            return []
+        failed = []
+        for attr, value in original['changes'].items():
+            try:
+                if attr == 'nice':
+                    proc.nice(value)
+                elif attr == 'affinity':
+                    proc.cpu_affinity(value)
+                elif IS_WINDOWS:
+                    proc.ionice(value)
+                else:
+                    proc.ionice(value.ioclass, value.value)
+            except psutil.NoSuchProcess:
+                return []
+            except (psutil.AccessDenied, OSError):
+                failed.append(RESTORE_LABELS[attr])
+        return failed
+
+    def scan_new_processes(self):
+        """Verifica só os PIDs que surgiram desde a última varredura."""
+        with self.lock:
+            current = set(psutil.pids())
+            new_pids = current - self.known_pids
+            self.known_pids = current
+            applied = {'game': 0, 'background': 0}
+            for pid in new_pids:
+                try:
+                    role = self._apply(psutil.Process(pid))
+                except psutil.NoSuchProcess:
+                    continue
+                if role:
+                    applied[role] += 1
+            # Esquece processos que já terminaram
+            for pid in [p for p in self.originals if p not in current]:
+                self.originals.pop(pid, None)
+            return applied
+
+    def _loop(self):
+        while not self.stop_event.wait(self.interval):
+            try:
+                self.scan_new_processes()
+            except Exception as e:
+                print(f"Erro no Game Mode: {e}")
+
+    def activate(self, target, game_cores=None, background_cores=None):
+        """Ativa o Game Mode para `target` (PID ou nome/padrão) e monitora novos processos.
+
+        game_cores/background_cores: listas de núcleos para cpu_affinity (None = não altera).
+        """
+        if self.active:
+            self.deactivate()
+        target = target.strip() if isinstance(target, str) else target
+        if isinstance(target, str) and target.isdigit():
+            target = int(target)
+        self.target = target.lower() if isinstance(target, str) else target
+        cpu_count = psutil.cpu_count() or 1
+        self.game_cores = [c for c in (game_cores or []) if c < cpu_count] or None
+        self.background_cores = [c for c in (background_cores or []) if c < cpu_count] or None
+
+        self.known_pids = set()
+        applied = self.scan_new_processes()
+        self.active = True
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        if not applied['game']:
+            return False, f"Game Mode ativo, mas '{target}' não foi encontrado (ou sem permissão). Monitorando novos processos..."
+        return True, f"Game Mode ativo: {applied['game']} processo(s) do jogo priorizados, {applied['background']} em segundo plano rebaixados."
+
+    def deactivate(self):
+        """Reverte prioridade, afinidade e I/O de todos os processos alterados."""
+        self.stop_event.set()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=self.interval * 2)
+        self.thread = None
+        with self.lock:
+            pids = list(self.originals)
+            names = {pid: self.originals[pid]['name'] for pid in pids}
+            failed = {}
+            for pid in pids:
+                attrs = self._restore(pid)
+                if attrs:
+                    failed[pid] = attrs
+        was_active, self.active = self.active, False
+        if not was_active and not pids:
+            return True, "Game Mode não estava ativo."
+        if failed:
+            details = "; ".join(f"{names[pid]} ({pid}): {', '.join(attrs)}" for pid, attrs in failed.items())
+            return False, f"Game Mode desativado. {len(failed)} de {len(pids)} processos não puderam ser revertidos (permissão negada) - {details}."
+        return True, f"Game Mode desativado. {len(pids)} processos revertidos."
@@ -0,0 +1,141 @@
+# bmark_memory.py
+import os
+import time
+import threading
+import psutil
+
+SAMPLES_PER_TICK = 8 # Processos com USS/PSS lidos por tick: custo por tick fica limitado
+PSI_MEMORY_FILE = "/proc/pressure/memory"
+
+
+def _read_smaps_rollup(pid):
+    """USS/PSS/RSS (bytes) via /proc/<pid>/smaps_rollup (Linux >= 4.14). None se indisponível."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            values = {}
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    values[parts[0][:-1]] = int(parts[1]) * 1024
+    except OSError:
+        return None
+    if 'Pss' not in values:
+        return None
+    uss = values.get('Private_Clean', 0) + values.get('Private_Dirty', 0) + values.get('Private_Hugetlb', 0)
+    return {'uss': uss, 'pss': values['Pss'], 'rss': values.get('Rss', 0)}
+
+
+def _read_psi():
+    """Linhas 'some'/'full' do PSI de memória (Linux). Ex.: {'some_avg10': 0.5, 'full_avg10': 0.0}."""
+    try:
+        with open(PSI_MEMORY_FILE) as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return None
+    psi = {}
+    for line in lines:
+        kind, *fields = line.split()
+        for field in fields:
+            key, _, value = field.partition("=")
+            if key in ('avg10', 'avg60'):
+                psi[f"{kind}_{key}"] = float(value)
+    return psi
+
+
+class MemoryAnalyzer:
+    """Classifica processos pela memória que realmente seria liberada (USS), amostrando em rodízio."""
+
+    def __init__(self, samples_per_tick=SAMPLES_PER_TICK):
+        self.samples_per_tick = samples_per_tick
+        self.use_smaps = os.path.exists("/proc/self/smaps_rollup")
+        self.detail = {} # pid -> {'create_time', 'uss', 'pss', 'sampled_at'}
+        self.swap_prev = None
+        # Chamado pelo loop de atualização e pelas threads de encerramento de processos
+        self.lock = threading.Lock()
+
+    def _sample_process(self, proc):
+        if self.use_smaps:
+            info = _read_smaps_rollup(proc.pid)
+            if info is not None:
+                return info
+        full = proc.memory_full_info() # uss em todas as plataformas; pss só no Linux
+        return {'uss': full.uss, 'pss': getattr(full, 'pss', None), 'rss': full.rss}
+
+    def get_top_processes(self, limit=20):
+        """Lista (nome, cpu%, memória, pid, fonte, pss) ordenada pela memória liberável (thread-safe).
+
+        fonte é 'uss' quando o processo já foi amostrado; senão 'rss' (superestimado: ainda não
+        chegou a vez ou sem acesso). Linhas USS vêm antes das RSS, cada grupo ordenado pela memória.
+        pss é None quando indisponível.
+        """
+        with self.lock:
+            return self._rank_processes(limit)
+
+    def _rank_processes(self, limit):
+        rows = {}
+        for proc in psutil.process_iter(['name', 'cpu_percent', 'memory_info', 'create_time']):
+            try:
+                rows[proc.pid] = (proc, proc.info['name'], proc.info['cpu_percent'] or 0.0,
+                                  proc.info['memory_info'].rss, proc.info['create_time'])
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess, AttributeError):
+                continue
+
+        # Descarta PIDs que terminaram ou foram reutilizados
+        for pid in list(self.detail):
+            if pid not in rows or rows[pid][4] != self.detail[pid]['create_time']:
+                del self.detail[pid]
+
+        # Rodízio: nunca amostrados primeiro (maior RSS antes), depois os mais antigos
+        queue = sorted(rows, key=lambda pid: (self.detail.get(pid, {}).get('sampled_at', 0.0), -rows[pid][3]))
+        sampled = 0
+        for pid in queue:
+            if sampled >= self.samples_per_tick:
+                break
+            proc, _, _, _, create_time = rows[pid]
+            # Conta tentativas, não sucessos: falhas também custam leitura no /proc
+            sampled += 1
+            try:
+                info = self._sample_process(proc)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                # Sem acesso: marca como amostrado para não travar o rodízio
+                self.detail[pid] = {'create_time': create_time, 'uss': None, 'pss': None, 'sampled_at': time.time()}
+                continue
+            self.detail[pid] = {'create_time': create_time, 'uss': info['uss'], 'pss': info['pss'], 'sampled_at': time.time()}
+
+        ranked = []
+        for pid, (_, name, cpu, rss, _) in rows.items():
+            detail = self.detail.get(pid, {})
+            if detail.get('uss') is not None:
+                ranked.append((name, cpu, detail['uss'], pid, 'uss', detail['pss']))
+            else:
+                ranked.append((name, cpu, rss, pid, 'rss', None))
+        # USS e RSS não são comparáveis: RSS vai para o fim em vez de disputar posição com USS
+        ranked.sort(key=lambda x: (x[4] == 'uss', x[2]), reverse=True)
+        return ranked[:limit]
+
+    def get_pressure(self):
+        """Sinais de pressão de memória: disponível, swap in/out (KB/s) e PSI no Linux."""
+        vm = psutil.virtual_memory()
+        swap = psutil.swap_memory()
+        now = time.time()
+        swap_in_kbps = swap_out_kbps = 0.0
+        with self.lock:
+            if self.swap_prev is not None:
+                prev_time, prev_sin, prev_sout = self.swap_prev
+                elapsed = max(now - prev_time, 1e-6)
+                swap_in_kbps = max(0, swap.sin - prev_sin) / elapsed / 1024
+                swap_out_kbps = max(0, swap.sout - prev_sout) / elapsed / 1024
+            self.swap_prev = (now, swap.sin, swap.sout)
+        return {
+            'available_percent': round(vm.available / vm.total * 100, 1),
+            'swap_percent': swap.percent,
+            'swap_in_kbps': round(swap_in_kbps, 1),
+            'swap_out_kbps': round(swap_out_kbps, 1),
+            'psi': _read_psi(),
+        }
+
+    def format_pressure(self, pressure):
+        text = f"Livre {pressure['available_percent']:.0f}% | Swap {pressure['swap_percent']:.0f}% (in {pressure['swap_in_kbps']:.0f} / out {pressure['swap_out_kbps']:.0f} KB/s)"
+        if pressure['psi']:
+            text += f" | PSI {pressure['psi'].get('some_avg10', 0.0):.1f}%"
+        return text
@@ -0,0 +1,168 @@
+# bmark_perfsuite.py
+# Suíte de regressão de desempenho dos caminhos críticos do BMark (roda sem interface).
+#
+#   python bmark_perfsuite.py                    -> compara com a baseline e falha se estourar o orçamento
+#   python bmark_perfsuite.py --update-baseline  -> grava os resultados atuais como nova baseline
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+import tracemalloc
+
+from bmark_sysmon import SystemMonitor
+from bmark_tweaks import SystemTweaks, FILE_TYPES
+from bmark_memory import MemoryAnalyzer
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bmark_perf_baseline.json")
+DEFAULT_TOLERANCE = 0.5 # Aceita até +50% sobre a baseline (máquinas e cargas variam)
+LATENCY_SLACK_MS = 5.0 # Folga absoluta mínima: evita falsos alarmes em operações de frações de ms
+
+
+# --- GERADORES DE CARGA SINTÉTICA ---
+
+def make_temp_tree(root, dirs=200, files_per_dir=50, file_size=512):
+    """Árvore no estilo %TEMP%: muitas pastas pequenas com arquivos pequenos."""
+    payload = b"x" * file_size
+    for d in range(dirs):
+        path = os.path.join(root, f"tmp{d:04d}", "cache")
+        os.makedirs(path, exist_ok=True)
+        for f in range(files_per_dir):
+            with open(os.path.join(path, f"f{f:04d}.tmp"), "wb") as fh:
+                fh.write(payload)
+
+
+def make_flat_folder(root, files=100_000):
+    """Pasta plana (Downloads) com extensões de todas as categorias de FILE_TYPES e algumas desconhecidas."""
+    extensions = [ext for exts in FILE_TYPES.values() for ext in exts] + [".bin", ".log"]
+    os.makedirs(root, exist_ok=True)
+    for i in range(files):
+        open(os.path.join(root, f"file{i:06d}{extensions[i % len(extensions)]}"), "wb").close()
+
+
+def spawn_dummy_processes(count=100):
+    cmd = [sys.executable, "-c", "import time; time.sleep(600)"]
+    return [subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for _ in range(count)]
+
+
+# --- MEDIÇÃO ---
+
+def measure(func, repeat=5, setup=None):
+    """Mediana do tempo (ms) de `func` em `repeat` execuções e pico de memória Python (KB).
+
+    O pico vem de uma execução extra com tracemalloc, que não entra no tempo (tracemalloc deixa tudo mais lento).
+    """
+    timings = []
+    for _ in range(repeat):
+        if setup: setup()
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    if setup: setup()
+    tracemalloc.start()
+    func()
+    peak_kb = tracemalloc.get_traced_memory()[1] / 1024
+    tracemalloc.stop()
+    return {'latency_ms': round(statistics.median(timings), 2), 'peak_kb': round(peak_kb, 1)}
+
+
+def run_suite(scale=1.0):
+    sys_monitor = SystemMonitor()
+    sys_tweaks = SystemTweaks()
+    results = {}
+    workdir = tempfile.mkdtemp(prefix="bmark_perf_")
+    procs = spawn_dummy_processes(int(100 * scale))
+    try:
+        time.sleep(0.5) # Deixa os processos fictícios subirem
+        sys_monitor.get_overview_data() # Primeira chamada de cpu_percent só inicializa o contador
+        results['get_top_processes'] = measure(lambda: sys_monitor.get_top_processes(limit=20))
+        results['get_overview_data'] = measure(sys_monitor.get_overview_data)
+        sys_monitor.get_network_speeds()
+        results['get_network_speeds'] = measure(sys_monitor.get_network_speeds)
+        memory_analyzer = MemoryAnalyzer()
+        results['memory_top_processes'] = measure(lambda: memory_analyzer.get_top_processes(limit=10))
+    finally:
+        for proc in procs: proc.kill()
+        for proc in procs: proc.wait()
+
+    try:
+        temp_root = os.path.join(workdir, "temp")
+        results['clean_path'] = measure(
+            lambda: sys_tweaks._clean_path(temp_root), repeat=3,
+            setup=lambda: make_temp_tree(temp_root, dirs=int(200 * scale)))
+
+        flat_root = os.path.join(workdir, "downloads")
+        results['run_organize_folder'] = measure(
+            lambda: sys_tweaks.run_organize_folder(flat_root), repeat=1,
+            setup=lambda: make_flat_folder(flat_root, files=int(100_000 * scale)))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+# --- COMPARAÇÃO COM A BASELINE ---
+
+def load_baseline(path=BASELINE_FILE):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def check_results(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Retorna a lista de violações. Orçamentos absolutos em baseline['budgets'] têm prioridade."""
+    failures = []
+    budgets = baseline.get('budgets', {})
+    reference = baseline.get('results', {})
+    for name, current in results.items():
+        for metric in ('latency_ms', 'peak_kb'):
+            limit = budgets.get(name, {}).get(metric)
+            if limit is None and metric in reference.get(name, {}):
+                limit = reference[name][metric] * (1 + tolerance)
+                if metric == 'latency_ms':
+                    limit = max(limit, reference[name][metric] + LATENCY_SLACK_MS)
+            if limit is not None and current[metric] > limit:
+                failures.append(f"{name}.{metric}: {current[metric]} > {limit:.1f}")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suíte de regressão de desempenho do BMark.")
+    parser.add_argument("--update-baseline", action="store_true", help="Grava os resultados como nova baseline.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Folga relativa sobre a baseline (0.5 = +50%%).")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplica o tamanho das cargas sintéticas.")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="Arquivo de baseline.")
+    args = parser.parse_args(argv)
+
+    results = run_suite(scale=args.scale)
+    for name, metrics in results.items():
+        print(f"{name:24s} {metrics['latency_ms']:10.2f} ms {metrics['peak_kb']:10.1f} KB")
+
+    baseline = load_baseline(args.baseline)
+    if args.update_baseline:
+        baseline['results'] = results
+        baseline['scale'] = args.scale
+        baseline.setdefault('budgets', {})
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=4)
+        print(f"Baseline gravada em {args.baseline}.")
+        return 0
+
+    if not baseline:
+        print("Nenhuma baseline encontrada. Rode com --update-baseline.")
+        return 0
+    if baseline.get('scale', 1.0) != args.scale:
+        print(f"AVISO: baseline gerada com --scale {baseline.get('scale')}, comparação pode não ser justa.")
+    failures = check_results(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"FALHA: {failure}")
+    print("OK: nenhum orçamento estourado." if not failures else f"{len(failures)} orçamento(s) estourado(s).")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
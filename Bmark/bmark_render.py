@@ -0,0 +1,108 @@
+# bmark_render.py
+import threading
+
+FRAME_MS = 50 # Intervalo do "frame" de UI: no máximo uma passada de configure() a cada 50 ms
+DEFERRED_CHECK_FRAMES = 5 # A cada 5 frames confere se widgets adiados voltaram a ficar visíveis
+
+
+class UIRenderer:
+    """Camada de renderização com dirty-check para os widgets atualizados periodicamente.
+
+    As threads de coleta e de tarefas chamam set() à vontade; o configure() só roda na thread do Tk.
+    Um pump no loop do Tk junta as mudanças pendentes e aplica todas em uma única passada
+    after_idle por frame, pulando valores repetidos e adiando widgets que não estão visíveis.
+    """
+
+    def __init__(self, root, frame_ms=FRAME_MS):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.last = {} # widget -> opções efetivamente aplicadas
+        self.pending = {} # widget -> opções a aplicar no próximo frame
+        self.deferred = {} # widget -> opções guardadas enquanto o widget está oculto
+        self.lock = threading.Lock()
+        self.flush_scheduled = False
+        self.frame_count = 0
+        self.stats = {'applied': 0, 'skipped_unchanged': 0, 'deferred_hidden': 0}
+
+    def set(self, widget, **options):
+        """Agenda configure(**options) se algo mudou em relação ao que já está na tela (thread-safe)."""
+        with self.lock:
+            # Estado mais recente conhecido: aplicado < adiado (aba oculta) < pendente
+            current = {**self.last.get(widget, {}), **self.deferred.get(widget, {}), **self.pending.get(widget, {})}
+            changed = {k: v for k, v in options.items() if k not in current or current[k] != v}
+            if not changed:
+                self.stats['skipped_unchanged'] += 1
+                return
+            self.pending.setdefault(widget, {}).update(changed)
+
+    def start(self):
+        """Inicia o pump de frames (chamar na thread do Tk)."""
+        self.root.after(self.frame_ms, self._pump)
+
+    def _pump(self):
+        self.frame_count += 1
+        if self.frame_count % DEFERRED_CHECK_FRAMES == 0:
+            self._requeue_visible()
+        with self.lock:
+            has_work = bool(self.pending)
+        if has_work and not self.flush_scheduled:
+            self.flush_scheduled = True
+            self.root.after_idle(self._flush)
+        self.root.after(self.frame_ms, self._pump)
+
+    def _flush(self):
+        self.flush_scheduled = False
+        with self.lock:
+            batch, self.pending = self.pending, {}
+        for widget, options in batch.items():
+            try:
+                if not widget.winfo_exists():
+                    self.forget(widget)
+                    continue
+                if not widget.winfo_viewable():
+                    # Aba oculta: guarda a última versão e aplica só quando ela voltar a aparecer
+                    with self.lock:
+                        self.deferred.setdefault(widget, {}).update(options)
+                    self.stats['deferred_hidden'] += 1
+                    continue
+                widget.configure(**options)
+            except Exception:
+                continue
+            with self.lock:
+                self.last.setdefault(widget, {}).update(options)
+            self.stats['applied'] += 1
+
+    def _requeue_visible(self):
+        """Reenfileira widgets adiados que voltaram a aparecer (ex.: janela restaurada após minimizar)."""
+        with self.lock:
+            widgets = list(self.deferred)
+        if not widgets:
+            return
+        visible = []
+        for widget in widgets:
+            try:
+                if not widget.winfo_exists():
+                    self.forget(widget)
+                elif widget.winfo_viewable():
+                    visible.append(widget)
+            except Exception:
+                continue
+        with self.lock:
+            for widget in visible:
+                options = self.deferred.pop(widget, None)
+                if options:
+                    self.pending.setdefault(widget, {}).update(options)
+
+    def refresh_deferred(self):
+        """Reenfileira as mudanças adiadas (chamar ao exibir uma aba)."""
+        with self.lock:
+            for widget, options in self.deferred.items():
+                self.pending.setdefault(widget, {}).update(options)
+            self.deferred = {}
+
+    def forget(self, widget):
+        """Remove o widget do cache (ex.: antes de destruí-lo)."""
+        with self.lock:
+            self.last.pop(widget, None)
+            self.pending.pop(widget, None)
+            self.deferred.pop(widget, None)
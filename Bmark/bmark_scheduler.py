@@ -0,0 +1,214 @@
+# bmark_scheduler.py
+import fnmatch
+import platform
+import threading
+import time
+from collections import deque
+import psutil
+
+IS_WINDOWS = platform.system() == "Windows"
+IDLE_WINDOW_S = 60 # Janela usada para decidir se a máquina está ociosa
+TICK_S = 1.0
+IDLE_CPU_PERCENT = 15.0 # CPU média (sem contar o próprio BMark) abaixo disso = ocioso
+IDLE_DISK_MBPS = 5.0 # Disco médio (sem contar o próprio BMark) abaixo disso = ocioso
+BUSY_CPU_PERCENT = 40.0 # Pico instantâneo que pausa o job imediatamente
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000 # SetThreadPriority (Windows): CPU, I/O e memória em prioridade baixa
+THREAD_MODE_BACKGROUND_END = 0x00020000
+BUSY_CHECK_S = 0.25 # Intervalo mínimo entre checagens de carga durante o job (cpu_percent é ruidoso em janelas curtas)
+# Processos que indicam jogo em execução (glob, minúsculos)
+GAME_PROCESS_PATTERNS = [
+    "cs2*", "csgo*", "valorant*", "fortnite*", "r5apex*", "leagueoflegends*", "dota2*",
+    "overwatch*", "eldenring*", "gta5*", "rocketleague*", "minecraft*", "javaw*", "steam_app_*",
+]
+
+
+def _lower_thread_priority():
+    """Coloca o thread atual em prioridade baixa de CPU e de I/O e devolve a função que desfaz.
+
+    No Linux nice/ionice valem por thread (TID). No Windows o psutil só altera o processo inteiro
+    (o que rebaixaria também a interface Tk), então usa THREAD_MODE_BACKGROUND_BEGIN, que vale só
+    para o thread atual. A função devolvida precisa ser chamada no mesmo thread.
+    """
+    if IS_WINDOWS:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        if not kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN):
+            return lambda: None
+        return lambda: kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_END)
+    try:
+        thread = psutil.Process(threading.get_native_id())
+        thread.nice(19)
+        if hasattr(thread, "ionice"):
+            thread.ionice(psutil.IOPRIO_CLASS_IDLE)
+    except (psutil.AccessDenied, psutil.NoSuchProcess, AttributeError):
+        pass
+    return lambda: None
+
+
+class MaintenanceJob:
+    """Job dividido em etapas: `steps` é um iterável e cada next() executa um pedaço do trabalho."""
+
+    def __init__(self, name, steps, on_done=None):
+        self.name = name
+        self.steps = iter(steps)
+        self.on_done = on_done
+        self.state = "na fila" # na fila / executando / pausado / concluído / erro
+        self.chunks_done = 0
+        self.result = 0
+
+    def run_chunk(self):
+        """Executa uma etapa. Retorna False quando o job terminou."""
+        try:
+            value = next(self.steps)
+        except StopIteration:
+            self.state = "concluído"
+            if self.on_done: self.on_done(self)
+            return False
+        if isinstance(value, (int, float)):
+            self.result += value
+        self.chunks_done += 1
+        return True
+
+
+class MaintenanceScheduler:
+    """Fila de manutenção que só roda com a máquina ociosa, sem jogo aberto e na tomada."""
+
+    def __init__(self, window_s=IDLE_WINDOW_S, tick_s=TICK_S, game_patterns=None):
+        self.window = deque(maxlen=max(1, int(window_s / tick_s)))
+        self.tick_s = tick_s
+        self.game_patterns = [p.lower() for p in (game_patterns or GAME_PROCESS_PATTERNS)]
+        self.jobs = deque()
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.self_proc = psutil.Process()
+        self.cpu_count = psutil.cpu_count() or 1
+        self.prev_disk = None
+        self.last_reason = "Aguardando amostras de ociosidade."
+
+    # --- FILA ---
+
+    def add_job(self, name, steps, on_done=None):
+        job = MaintenanceJob(name, steps, on_done)
+        with self.lock:
+            self.jobs.append(job)
+        return job
+
+    def get_status(self):
+        with self.lock:
+            jobs = [(job.name, job.state, job.chunks_done) for job in self.jobs]
+        return jobs, self.last_reason
+
+    # --- DETECÇÃO DE OCIOSIDADE ---
+
+    def _own_io_bytes(self):
+        try:
+            io = self.self_proc.io_counters()
+            return io.read_bytes + io.write_bytes
+        except (psutil.AccessDenied, AttributeError):
+            return 0
+
+    def _sample(self):
+        """CPU e disco do sistema descontando o próprio BMark (o job não pode se "ver" como carga)."""
+        now = time.monotonic()
+        cpu = psutil.cpu_percent(interval=None)
+        own_cpu = self.self_proc.cpu_percent(interval=None) / self.cpu_count
+        disk = psutil.disk_io_counters()
+        disk_bytes = (disk.read_bytes + disk.write_bytes) if disk else 0
+        own_io = self._own_io_bytes()
+        disk_mbps = 0.0
+        if self.prev_disk is not None:
+            prev_time, prev_bytes, prev_own = self.prev_disk
+            elapsed = max(now - prev_time, 1e-6)
+            disk_mbps = max(0, (disk_bytes - prev_bytes) - (own_io - prev_own)) / elapsed / (1024 * 1024)
+        self.prev_disk = (now, disk_bytes, own_io)
+        sample = (max(0.0, cpu - own_cpu), disk_mbps)
+        self.window.append(sample)
+        return sample
+
+    def _game_running(self):
+        for proc in psutil.process_iter(['name']):
+            name = (proc.info['name'] or "").lower()
+            if any(fnmatch.fnmatch(name, pattern) for pattern in self.game_patterns):
+                return name
+        return None
+
+    def _on_ac_power(self):
+        battery = psutil.sensors_battery() if hasattr(psutil, "sensors_battery") else None
+        return battery is None or battery.power_plugged is not False # Desktop (sem bateria) conta como tomada
+
+    def is_idle(self):
+        """Retorna (ocioso, motivo). Exige a janela cheia com médias abaixo dos limites."""
+        if len(self.window) < self.window.maxlen:
+            return False, f"Coletando amostras ({len(self.window)}/{self.window.maxlen})."
+        avg_cpu = sum(c for c, _ in self.window) / len(self.window)
+        avg_disk = sum(d for _, d in self.window) / len(self.window)
+        if avg_cpu >= IDLE_CPU_PERCENT:
+            return False, f"CPU ocupada ({avg_cpu:.0f}%)."
+        if avg_disk >= IDLE_DISK_MBPS:
+            return False, f"Disco ocupado ({avg_disk:.1f} MB/s)."
+        if not self._on_ac_power():
+            return False, "Na bateria."
+        game = self._game_running()
+        if game:
+            return False, f"Jogo em execução ({game})."
+        return True, "Ocioso."
+
+    def _load_returned(self, sample):
+        """Checagem rápida entre etapas: pausa assim que a carga volta."""
+        cpu, disk = sample
+        return cpu >= BUSY_CPU_PERCENT or disk >= IDLE_DISK_MBPS * 2
+
+    # --- LOOP ---
+
+    def _loop(self):
+        while not self.stop_event.is_set():
+            self._sample()
+            idle, self.last_reason = self.is_idle()
+            with self.lock:
+                job = self.jobs[0] if self.jobs else None
+            if idle and job is not None and job.state != "concluído":
+                restore = _lower_thread_priority()
+                try:
+                    self._run_until_busy(job)
+                finally:
+                    restore()
+            elif job is not None and job.state == "executando":
+                job.state = "pausado"
+            self.stop_event.wait(self.tick_s)
+
+    def _run_until_busy(self, job):
+        job.state = "executando"
+        last_check = time.monotonic()
+        while not self.stop_event.is_set():
+            try:
+                more = job.run_chunk()
+            except Exception as e:
+                job.state = "erro"
+                self.last_reason = f"Erro em '{job.name}': {e}"
+                more = False
+            if not more:
+                with self.lock:
+                    if self.jobs and self.jobs[0] is job:
+                        self.jobs.popleft()
+                return
+            if time.monotonic() - last_check < BUSY_CHECK_S:
+                continue
+            last_check = time.monotonic()
+            if self._load_returned(self._sample()):
+                job.state = "pausado"
+                self.last_reason = "Carga detectada: job pausado."
+                self.window.clear() # Exige uma nova janela ociosa completa antes de retomar
+                return
+
+    def start(self):
+        self.stop_event.clear()
+        psutil.cpu_percent(interval=None) # Inicializa os contadores de CPU
+        self.self_proc.cpu_percent(interval=None)
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=self.tick_s * 5)
@@ -3,10 +3,23 @@ import psutil
 import platform
 import subprocess
 import re
+import os
+import json
+import fnmatch
 from datetime import datetime
 import time
 import random
 
+from bmark_thermal import ThermalTracer, normalize_to_frequency
+
+KILL_LIST_FILE = "bmark_kill_list.json" # Preset "Kill List Pré-Jogo"
+# Processos que nunca devem ser encerrados em massa
+PROTECTED_PROCESSES = {
+    "system", "system idle process", "registry", "smss.exe", "csrss.exe", "wininit.exe",
+    "winlogon.exe", "services.exe", "lsass.exe", "svchost.exe", "dwm.exe", "explorer.exe",
+    "systemd", "init", "kthreadd", "sshd", "xorg", "gnome-shell", "kwin_x11", "kwin_wayland",
+}
+
 class SystemMonitor:
     
     def __init__(self):
@@ -53,6 +66,52 @@ class SystemMonitor:
         
         return metrics
 
+    def measure_latency_metrics_traced(self, before_tweak=True, duration=2.0, reference_mhz=None):
+        """Mede as métricas registrando clock e temperatura da CPU sob carga durante a janela de medição.
+
+        O trace cobre um laço fixo de CPU de `duration` segundos em um núcleo (o clock lido é o desse
+        núcleo quando o sistema informa por núcleo); o início da carga (subida até o boost) é descartado.
+        Retorna (métricas, resumo_do_trace). Com reference_mhz, as métricas são normalizadas para esse clock.
+        """
+        core = self._pick_load_core()
+        tracer = ThermalTracer(cpu_index=core)
+        tracer.start()
+        started = time.perf_counter()
+        metrics = self.measure_latency_metrics(before_tweak=before_tweak)
+        self._cpu_load(max(0.0, duration - (time.perf_counter() - started)), core)
+        trace = tracer.stop()
+        if reference_mhz:
+            metrics = normalize_to_frequency(metrics, trace, reference_mhz)
+        return metrics, trace
+
+    def _pick_load_core(self):
+        """Núcleo em que a carga do trace roda (o último permitido), ou None se não dá para fixar a thread."""
+        if not hasattr(os, "sched_setaffinity"):
+            return None # Windows/macOS: sem afinidade por thread na stdlib; o trace usa o clock geral
+        try:
+            return max(os.sched_getaffinity(0))
+        except OSError:
+            return None
+
+    def _cpu_load(self, duration, core=None):
+        """Carga fixa de CPU (uma thread, fixada em `core` no Linux) pelo tempo informado."""
+        previous = None
+        if core is not None:
+            try:
+                previous = os.sched_getaffinity(0) # No Linux, pid 0 = a thread atual
+                os.sched_setaffinity(0, {core})
+            except OSError:
+                previous = None
+        try:
+            deadline = time.perf_counter() + duration
+            x = 1
+            while time.perf_counter() < deadline:
+                for _ in range(10_000):
+                    x = (x * 1103515245 + 12345) & 0x7FFFFFFF
+        finally:
+            if previous is not None:
+                os.sched_setaffinity(0, previous)
+
     # --- O resto das funções (get_overview_data, get_ping_data, etc.) permanece o mesmo ---
     
     def get_overview_data(self):
@@ -64,8 +123,10 @@ class SystemMonitor:
         used_ram_gb = ram_info.used / (1024**3)
         data['ram_percent'] = ram_info.percent
         data['ram_details'] = f"{used_ram_gb:.1f} GB / {total_ram_gb:.1f} GB"
-        disk_info = psutil.disk_usage('/')
+        disk_path = self.get_system_drive()
+        disk_info = psutil.disk_usage(disk_path)
         data['disk_percent'] = disk_info.percent
+        data['disk_label'] = f"{disk_path} ({disk_info.free / (1024**3):.0f} GB livres)"
         boot_time_timestamp = psutil.boot_time()
         uptime_delta = datetime.now() - datetime.fromtimestamp(boot_time_timestamp)
         hours = uptime_delta.seconds // 3600
@@ -75,6 +136,12 @@ class SystemMonitor:
         data['gpu_percent'] = 25 + (time.time() * 0.1 % 5) 
         return data
 
+    def get_system_drive(self):
+        """Raiz do volume do sistema: 'C:\\' (ou o SystemDrive configurado) no Windows, '/' nos demais."""
+        if platform.system() == "Windows":
+            return os.environ.get('SystemDrive', 'C:') + '\\'
+        return '/'
+
     def get_ping_data(self):
         # (Omitido por brevidade, código idêntico ao anterior)
         try:
@@ -115,13 +182,168 @@ class SystemMonitor:
         processes.sort(key=lambda x: x[2], reverse=True)
         return processes[:limit]
     
-    def terminate_process_by_pid(self, pid):
-        # (Omitido por brevidade, código idêntico ao anterior)
+    def terminate_process_by_pid(self, pid, timeout=3.0):
         try:
             process = psutil.Process(pid)
-            process.terminate()
-            return True, f"Processo {pid} encerrado com sucesso."
         except psutil.NoSuchProcess:
             return False, f"Erro: Processo {pid} não encontrado."
-        except psutil.AccessDenied:
-            return False, f"Erro: Permissão negada para encerrar {pid}."
\ No newline at end of file
+        outcome = self.terminate_processes([process], timeout=timeout)[0]
+        if outcome['status'] in ('terminated', 'killed', 'gone'):
+            return True, f"Processo {pid} encerrado com sucesso ({outcome['status']})."
+        if outcome['status'] == 'access_denied':
+            return False, f"Erro: Permissão negada para encerrar {pid}."
+        return False, f"Erro: Processo {pid} não respondeu ao encerramento."
+
+    # --- GERENCIAMENTO DE PROCESSOS EM MASSA ---
+
+    def _is_protected(self, proc):
+        if proc.pid in (0, 1, 4, os.getpid(), os.getppid()):
+            return True
+        try:
+            return proc.name().lower() in PROTECTED_PROCESSES
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            return True
+
+    def find_processes(self, names=None, pattern=None, parent_pid=None, username=None):
+        """Seleciona processos por nome exato, padrão (glob, ex: 'chrome*'), árvore de um PID pai ou usuário."""
+        names = {n.lower() for n in (names or [])}
+        pattern = pattern.lower() if pattern else None
+        if parent_pid is not None:
+            try:
+                parent = psutil.Process(parent_pid)
+                candidates = [parent] + parent.children(recursive=True)
+            except psutil.NoSuchProcess:
+                return []
+        else:
+            candidates = psutil.process_iter(['name', 'username'])
+
+        selected = []
+        for proc in candidates:
+            try:
+                name = (proc.name() or "").lower()
+                if names and name not in names: continue
+                if pattern and not fnmatch.fnmatch(name, pattern): continue
+                if username and (proc.username() or "").lower().split("\\")[-1] != username.lower().split("\\")[-1]: continue
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                continue
+            if not self._is_protected(proc):
+                selected.append(proc)
+        return selected
+
+    def terminate_processes(self, processes, timeout=3.0, kill_timeout=2.0):
+        """Envia terminate() a todos, aguarda em conjunto com wait_procs e escala para kill() nos restantes.
+
+        Retorna uma lista de dicts {pid, name, status} com status em:
+        terminated, killed, gone, access_denied, survived.
+        """
+        outcomes = {}
+        signalled = []
+        for proc in processes:
+            try:
+                name = proc.name()
+            except (psutil.NoSuchProcess, psutil.ZombieProcess):
+                outcomes[proc.pid] = {'pid': proc.pid, 'name': None, 'status': 'gone'}
+                continue
+            except psutil.AccessDenied:
+                name = None
+            outcomes[proc.pid] = {'pid': proc.pid, 'name': name, 'status': 'survived'}
+            try:
+                proc.terminate()
+                signalled.append(proc)
+            except psutil.NoSuchProcess:
+                outcomes[proc.pid]['status'] = 'gone'
+            except psutil.AccessDenied:
+                outcomes[proc.pid]['status'] = 'access_denied'
+
+        # Uma única espera para todos os processos: o tempo total fica limitado a timeout + kill_timeout
+        gone, alive = psutil.wait_procs(signalled, timeout=timeout)
+        for proc in gone:
+            outcomes[proc.pid]['status'] = 'terminated'
+
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                outcomes[proc.pid]['status'] = 'terminated'
+            except psutil.AccessDenied:
+                outcomes[proc.pid]['status'] = 'access_denied'
+        killed, _ = psutil.wait_procs(alive, timeout=kill_timeout)
+        for proc in killed:
+            if outcomes[proc.pid]['status'] == 'survived':
+                outcomes[proc.pid]['status'] = 'killed'
+
+        return list(outcomes.values())
+
+    def summarize_termination(self, outcomes):
+        """Resume o resultado de terminate_processes em (sucesso, mensagem)."""
+        if not outcomes:
+            return False, "Nenhum processo correspondente encontrado."
+        counts = {}
+        for outcome in outcomes:
+            counts[outcome['status']] = counts.get(outcome['status'], 0) + 1
+        ended = counts.get('terminated', 0) + counts.get('killed', 0) + counts.get('gone', 0)
+        failed = counts.get('access_denied', 0) + counts.get('survived', 0)
+        message = f"{ended}/{len(outcomes)} processos encerrados ({counts.get('killed', 0)} forçados com kill)"
+        if failed:
+            message += f", {failed} falharam (permissão negada ou sem resposta)"
+        return failed == 0, message + "."
+
+    def _select_by_query(self, query):
+        """Seleção a partir de texto: 'user:<nome>', 'tree:<pid>', padrão glob ('*', '?') ou nome exato."""
+        query = query.strip()
+        kind, sep, value = query.partition(":")
+        if sep and kind.lower() == "user" and value.strip():
+            return self.find_processes(username=value.strip())
+        if sep and kind.lower() == "tree" and value.strip().isdigit():
+            return self.find_processes(parent_pid=int(value))
+        if any(ch in query for ch in "*?["):
+            return self.find_processes(pattern=query)
+        return self.find_processes(names=[query])
+
+    def terminate_by_name(self, query, timeout=3.0):
+        """Encerra processos por nome exato, padrão glob, 'user:<nome>' ou 'tree:<pid>'."""
+        outcomes = self.terminate_processes(self._select_by_query(query), timeout=timeout)
+        return (*self.summarize_termination(outcomes), outcomes)
+
+    def terminate_tree(self, pid, timeout=3.0):
+        """Encerra um processo e todos os seus descendentes de uma vez."""
+        outcomes = self.terminate_processes(self.find_processes(parent_pid=pid), timeout=timeout)
+        return (*self.summarize_termination(outcomes), outcomes)
+
+    def terminate_by_user(self, username, pattern=None, timeout=3.0):
+        """Encerra os processos de um usuário (opcionalmente só os que casam com `pattern`)."""
+        outcomes = self.terminate_processes(self.find_processes(pattern=pattern, username=username), timeout=timeout)
+        return (*self.summarize_termination(outcomes), outcomes)
+
+    # --- KILL LIST PRÉ-JOGO ---
+
+    def load_kill_list(self):
+        if not os.path.exists(KILL_LIST_FILE):
+            return []
+        try:
+            with open(KILL_LIST_FILE, 'r') as f:
+                return json.load(f).get('entries', [])
+        except (OSError, ValueError):
+            return []
+
+    def save_kill_list(self, entries):
+        """Salva a lista do preset pré-jogo (nomes, padrões glob ou 'user:<nome>')."""
+        entries = sorted({e.strip() for e in entries if e and e.strip()})
+        try:
+            with open(KILL_LIST_FILE, 'w') as f:
+                json.dump({'entries': entries}, f, indent=4)
+            return True, f"Kill List salva com {len(entries)} entradas."
+        except OSError as e:
+            return False, f"Falha ao salvar Kill List: {str(e)}"
+
+    def run_kill_list(self, timeout=3.0):
+        """Encerra de uma vez todos os processos do preset pré-jogo."""
+        entries = self.load_kill_list()
+        if not entries:
+            return False, "Kill List vazia. Salve nomes ou padrões primeiro.", []
+        selected = {}
+        for entry in entries:
+            for proc in self._select_by_query(entry):
+                selected[proc.pid] = proc
+        outcomes = self.terminate_processes(list(selected.values()), timeout=timeout)
+        return (*self.summarize_termination(outcomes), outcomes)
\ No newline at end of file
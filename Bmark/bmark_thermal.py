@@ -0,0 +1,190 @@
+# bmark_thermal.py
+import glob
+import time
+import threading
+import psutil
+
+TRACE_INTERVAL_S = 0.05 # 20 Hz: rápido o bastante para pegar quedas curtas de clock
+FREQ_DRIFT_LIMIT = 0.10 # Variação de clock (min vs max) acima de 10% invalida a medição
+FREQ_DROP_LIMIT = 0.85 # Clock abaixo de 85% do inicial = possível throttling
+CPU_SENSOR_NAMES = ("coretemp", "k10temp", "zenpower", "cpu_thermal", "cpu-thermal", "acpitz")
+THROTTLE_COUNT_GLOB = "/sys/devices/system/cpu/cpu*/thermal_throttle/core_throttle_count"
+WARMUP_S = 0.3 # Amostras do início da carga (subida do clock ocioso -> boost) não entram no resumo
+FREQ_INDEPENDENT_KEYS = ("network",) # Métricas que não dependem do clock da CPU (não são normalizadas)
+
+
+def _read_cpu_temp():
+    """Temperatura atual da CPU e limite 'high' do sensor (None se indisponível, ex.: Windows)."""
+    sensors_fn = getattr(psutil, "sensors_temperatures", None)
+    if sensors_fn is None:
+        return None, None
+    try:
+        sensors = sensors_fn()
+    except (OSError, RuntimeError):
+        return None, None
+    entries = []
+    for name in CPU_SENSOR_NAMES:
+        if sensors.get(name):
+            entries = sensors[name]
+            break
+    if not entries:
+        entries = [e for group in sensors.values() for e in group]
+    readings = [e for e in entries if e.current is not None]
+    if not readings:
+        return None, None
+    hottest = max(readings, key=lambda e: e.current)
+    return hottest.current, hottest.high
+
+
+def _read_throttle_count():
+    """Soma dos contadores de throttling térmico do kernel (Linux/Intel). None se não existir."""
+    paths = glob.glob(THROTTLE_COUNT_GLOB)
+    if not paths:
+        return None
+    total = 0
+    for path in paths:
+        try:
+            with open(path) as f:
+                total += int(f.read().strip())
+        except (OSError, ValueError):
+            continue
+    return total
+
+
+class ThermalTracer:
+    """Registra clock e temperatura da CPU em segundo plano durante um benchmark."""
+
+    def __init__(self, interval=TRACE_INTERVAL_S, drift_limit=FREQ_DRIFT_LIMIT,
+                 drop_limit=FREQ_DROP_LIMIT, temp_limit_c=None, cpu_index=None, warmup_s=WARMUP_S):
+        self.interval = interval
+        self.cpu_index = cpu_index # Núcleo carregado: lê o clock dele em vez da média de todos
+        self.warmup_s = warmup_s
+        self.drift_limit = drift_limit
+        self.drop_limit = drop_limit
+        self.temp_limit_c = temp_limit_c
+        self.samples = [] # (t, freq_mhz, temp_c)
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.sensor_high_c = None
+        self.throttle_count_start = None
+        self.started_at = None
+
+    def _read_freq(self):
+        """Clock do núcleo carregado quando o sistema informa por núcleo; senão o clock geral."""
+        if self.cpu_index is not None:
+            try:
+                per_cpu = psutil.cpu_freq(percpu=True)
+            except (OSError, NotImplementedError):
+                per_cpu = None
+            if per_cpu and len(per_cpu) > self.cpu_index:
+                return per_cpu[self.cpu_index]
+        return psutil.cpu_freq()
+
+    def _sample(self):
+        freq = self._read_freq()
+        temp, high = _read_cpu_temp()
+        if high:
+            self.sensor_high_c = high
+        self.samples.append((time.perf_counter() - self.started_at, freq.current if freq else None, temp))
+
+    def _loop(self):
+        while not self.stop_event.is_set():
+            try:
+                self._sample()
+            except Exception:
+                pass
+            self.stop_event.wait(self.interval)
+
+    def start(self):
+        self.samples = []
+        self.stop_event.clear()
+        self.started_at = time.perf_counter()
+        self.throttle_count_start = _read_throttle_count()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Para a coleta e retorna o resumo (validade, drift de clock, temperatura)."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+        try:
+            self._sample() # Garante ao menos uma amostra no fim do benchmark
+        except Exception:
+            pass
+        return self.summary()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def summary(self):
+        samples = [s for s in self.samples if s[0] >= self.warmup_s]
+        freqs = [f for _, f, _ in samples if f]
+        temps = [t for _, _, t in samples if t is not None]
+        result = {
+            'samples': len(samples),
+            'freq_avg_mhz': round(sum(freqs) / len(freqs), 1) if freqs else None,
+            'freq_min_mhz': round(min(freqs), 1) if freqs else None,
+            'freq_max_mhz': round(max(freqs), 1) if freqs else None,
+            'freq_drift_pct': None,
+            'temp_start_c': temps[0] if temps else None,
+            'temp_max_c': max(temps) if temps else None,
+            'throttle_events': None,
+            'valid': True, # None = não verificável (sem temperatura, clock fixo e sem contador de throttling)
+            'reasons': [],
+        }
+
+        if freqs:
+            drift = (max(freqs) - min(freqs)) / max(freqs)
+            result['freq_drift_pct'] = round(drift * 100, 1)
+            if drift > self.drift_limit:
+                result['valid'] = False
+                result['reasons'].append(f"Variação de clock de {drift * 100:.1f}% (limite {self.drift_limit * 100:.0f}%)")
+            if min(freqs) < freqs[0] * self.drop_limit:
+                result['valid'] = False
+                result['reasons'].append(f"Clock caiu de {freqs[0]:.0f} para {min(freqs):.0f} MHz")
+
+        temp_limit = self.temp_limit_c or self.sensor_high_c
+        if temps and temp_limit and max(temps) >= temp_limit:
+            result['valid'] = False
+            result['reasons'].append(f"Temperatura atingiu {max(temps):.0f}°C (limite {temp_limit:.0f}°C)")
+
+        throttle_end = _read_throttle_count()
+        if self.throttle_count_start is not None and throttle_end is not None:
+            result['throttle_events'] = throttle_end - self.throttle_count_start
+            if result['throttle_events'] > 0:
+                result['valid'] = False
+                result['reasons'].append(f"{result['throttle_events']} eventos de throttling térmico do kernel")
+
+        # Ex.: Windows sem sensores e com cpu_freq() fixo: nada foi de fato conferido
+        clock_observable = bool(freqs) and max(freqs) != min(freqs)
+        if result['valid'] and not temps and not clock_observable and result['throttle_events'] is None:
+            result['valid'] = None
+            result['reasons'].append("Sem sensor de temperatura e com clock fixo informado pelo sistema")
+        return result
+
+
+def normalize_to_frequency(metrics, trace_summary, reference_mhz):
+    """Ajusta métricas para um clock de referência.
+
+    Tempos/latências (menor é melhor) escalam com freq_avg / referência; taxas
+    (kHz, FPS, maior é melhor) com o inverso. Métricas de rede ficam como estão. Sem dados de
+    clock, devolve as métricas sem alteração.
+    """
+    avg = trace_summary.get('freq_avg_mhz')
+    if not avg or not reference_mhz:
+        return dict(metrics)
+    ratio = avg / reference_mhz
+    normalized = {}
+    for key, value in metrics.items():
+        if not isinstance(value, (int, float)) or any(k in key for k in FREQ_INDEPENDENT_KEYS):
+            normalized[key] = value
+        elif 'khz' in key or 'fps' in key:
+            normalized[key] = round(value / ratio, 2)
+        else:
+            normalized[key] = round(value * ratio, 2)
+    return normalized
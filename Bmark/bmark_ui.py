@@ -5,9 +5,17 @@ import time
 import os
 import json 
 import platform 
+from tkinter import filedialog
 
 from bmark_sysmon import SystemMonitor
 from bmark_tweaks import SystemTweaks, WARNING_COLOR, SUCCESS_COLOR, SNAPSHOT_FILE
+from bmark_fleet import FleetAgent, parse_addr, DEFAULT_COLLECTOR_HOST, FLEET_TOKEN_ENV
+from bmark_frametime import FrameTimeAnalyzer
+from bmark_diskusage import DiskAnalyzer
+from bmark_gamemode import GameModeManager
+from bmark_memory import MemoryAnalyzer
+from bmark_scheduler import MaintenanceScheduler
+from bmark_render import UIRenderer
 
 # --- CONFIGURAÇÃO DE TEMA ---
 ctk.set_appearance_mode("Dark")
@@ -20,16 +28,39 @@ BACKGROUND_COLOR = "#1e2a38"
 CARD_BACKGROUND_COLOR = "#2c3e50"    
 GRAY_TEXT = "#bdc3c7"                
 
+UPDATE_INTERVAL_S = 3 # Intervalo de coleta; o UIRenderer só redesenha o que mudou
+PROCESS_LIST_ROWS = 10
+
 class BMarkApp(ctk.CTk):
     def __init__(self):
         super().__init__()
 
+        # Toda atualização periódica de widgets passa pelo renderer (dirty-check + 1 passada por frame)
+        self.renderer = UIRenderer(self)
+        self.renderer.start()
         self.sys_monitor = SystemMonitor()
         self.sys_tweaks = SystemTweaks()
+        self.frametime_analyzer = FrameTimeAnalyzer()
+        self.game_mode = GameModeManager()
+        self.memory_analyzer = MemoryAnalyzer()
+        self.maintenance = MaintenanceScheduler()
+        self.maintenance.start()
         
         self.stop_event = threading.Event()
         self.hardware_profile = self.sys_monitor.get_hardware_profile() # Perfil da máquina
         self.benchmark_metrics_before = None # Armazena resultados antes
+        self.benchmark_trace_before = None # Trace de clock/temperatura da medição ANTES
+
+        # Modo agente (opcional): BMARK_COLLECTOR=host[:porta] envia métricas ao coletor da frota
+        self.fleet_agent = None
+        collector = os.environ.get("BMARK_COLLECTOR")
+        if collector:
+            try:
+                host, port = parse_addr(collector, DEFAULT_COLLECTOR_HOST)
+                self.fleet_agent = FleetAgent(host, port, sys_monitor=self.sys_monitor, token=os.environ.get(FLEET_TOKEN_ENV))
+                self.fleet_agent.start()
+            except ValueError as e:
+                print(f"AVISO: BMARK_COLLECTOR ignorado. {e}")
         
         self.title("BMark - Otimizador de Sistema Profissional (eSports)")
         self.geometry("1200x750") 
@@ -90,7 +121,7 @@ class BMarkApp(ctk.CTk):
         button.grid(row=row, column=0, padx=10, pady=5, sticky="ew")
         return button
 
-    def _create_info_card(self, parent, title, row, col, icon_text, icon_color=PRIMARY_COLOR_LIGHT):
+    def _create_info_card(self, parent, title, row, col, icon_text, icon_color=PRIMARY_COLOR_LIGHT, sub_text="Loading..."):
         card = ctk.CTkFrame(parent, fg_color=CARD_BACKGROUND_COLOR, corner_radius=8, height=120)
         card.grid(row=row, column=col, padx=8, pady=8, sticky="nsew")
         
@@ -100,7 +131,7 @@ class BMarkApp(ctk.CTk):
         card.main_value_label = ctk.CTkLabel(card, text="--.-%", font=ctk.CTkFont(size=24, weight="bold"), text_color=TEXT_COLOR)
         card.main_value_label.place(relx=0.5, rely=0.4, anchor="center") 
         
-        card.sub_value_label = ctk.CTkLabel(card, text="Loading...", font=ctk.CTkFont(size=11), text_color=GRAY_TEXT)
+        card.sub_value_label = ctk.CTkLabel(card, text=sub_text, font=ctk.CTkFont(size=11), text_color=GRAY_TEXT)
         card.sub_value_label.place(relx=0.5, rely=0.8, anchor="center")
         
         return card
@@ -123,6 +154,8 @@ class BMarkApp(ctk.CTk):
             
             # Exibe o frame selecionado
             self.frames[name].grid(row=0, column=1, sticky="nsew", padx=20, pady=20)
+            # Aplica os valores que chegaram enquanto a aba estava oculta
+            self.renderer.refresh_deferred()
 
 
     # =======================================================================
@@ -140,7 +173,7 @@ class BMarkApp(ctk.CTk):
         self.cpu_card = self._create_info_card(frame, "CPU Usage", 1, 0, "💻", PRIMARY_COLOR_LIGHT)
         self.ram_card = self._create_info_card(frame, "RAM Usage", 1, 1, "💾", "#2ecc71")
         self.disk_card = self._create_info_card(frame, "Disk Usage", 1, 2, "💽", "#f1c40f")
-        self.uptime_card = self._create_info_card(frame, "Uptime", 1, 3, "⏱️", "#9b59b6")
+        self.uptime_card = self._create_info_card(frame, "Uptime", 1, 3, "⏱️", "#9b59b6", sub_text="Total Uptime")
         
         # Lista de Hardware (Nova)
         hardware_frame = ctk.CTkFrame(frame, fg_color=CARD_BACKGROUND_COLOR, corner_radius=10)
@@ -197,6 +230,9 @@ class BMarkApp(ctk.CTk):
         ctk.CTkButton(btn_frame, text="1. Medir Antes dos Tweaks", command=self._run_benchmark_before, fg_color=PRIMARY_COLOR_DARK, hover_color="#555").grid(row=0, column=0, padx=10, pady=15, sticky="ew")
         ctk.CTkButton(btn_frame, text="2. Aplicar Tweaks", command=lambda: self.select_frame_by_name("system_tweaks"), fg_color=PRIMARY_COLOR_LIGHT, hover_color=PRIMARY_COLOR_DARK).grid(row=0, column=1, padx=10, pady=15, sticky="ew")
         ctk.CTkButton(btn_frame, text="3. Medir DEPOIS dos Tweaks", command=self._run_benchmark_after, fg_color=PRIMARY_COLOR_DARK, hover_color="#555").grid(row=0, column=2, padx=10, pady=15, sticky="ew")
+        ctk.CTkButton(btn_frame, text="🎞️ Analisar Captura de Frames (PresentMon CSV: escolha ANTES e, opcionalmente, DEPOIS)", command=self._run_frametime_analysis, fg_color=PRIMARY_COLOR_LIGHT, hover_color=PRIMARY_COLOR_DARK).grid(row=1, column=0, columnspan=3, padx=10, pady=(0, 15), sticky="ew")
+        self.normalize_freq_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(btn_frame, text="Normalizar resultado DEPOIS pelo clock da CPU medido ANTES", variable=self.normalize_freq_var).grid(row=2, column=0, columnspan=3, padx=10, pady=(0, 15), sticky="w")
         
         self.result_frame = ctk.CTkFrame(frame, fg_color=CARD_BACKGROUND_COLOR, corner_radius=10)
         self.result_frame.grid(row=2, column=0, columnspan=3, padx=10, pady=10, sticky="nsew")
@@ -236,6 +272,7 @@ class BMarkApp(ctk.CTk):
         org_frame.grid_columnconfigure((0, 1), weight=1)
         ctk.CTkButton(org_frame, text="Organizar Desktop", command=lambda: self._run_folder_org_thread(os.path.join(os.path.expanduser('~'), 'Desktop')), fg_color=PRIMARY_COLOR_DARK, hover_color=PRIMARY_COLOR_LIGHT).grid(row=0, column=0, padx=(20, 10), pady=15, sticky="ew")
         ctk.CTkButton(org_frame, text="Organizar Downloads", command=lambda: self._run_folder_org_thread(os.path.join(os.path.expanduser('~'), 'Downloads')), fg_color=PRIMARY_COLOR_DARK, hover_color=PRIMARY_COLOR_LIGHT).grid(row=0, column=1, padx=(10, 20), pady=15, sticky="ew")
+        ctk.CTkButton(org_frame, text="🔍 Procurar Arquivos Duplicados...", command=self._run_find_duplicates_thread, fg_color=PRIMARY_COLOR_DARK, hover_color=PRIMARY_COLOR_LIGHT).grid(row=1, column=0, columnspan=2, padx=20, pady=(0, 15), sticky="ew")
 
         self.tweaks_result_label = ctk.CTkLabel(frame, text="Selecione o perfil e aplique os tweaks.", justify="left", font=("Arial", 14), text_color=GRAY_TEXT)
         self.tweaks_result_label.grid(row=4, column=0, sticky="w", padx=10, pady=10)
@@ -247,10 +284,10 @@ class BMarkApp(ctk.CTk):
         ctk.CTkLabel(frame, text="🌐 Network | Latência e Tráfego", font=ctk.CTkFont(size=28, weight="bold"), anchor="w").grid(row=0, column=0, columnspan=4, sticky="ew", pady=(0, 20))
 
         # Cards
-        self.ping_card = self._create_info_card(frame, "Ping (Google DNS)", 1, 0, "📡", PRIMARY_COLOR_LIGHT)
-        self.upload_card = self._create_info_card(frame, "Upload Speed (KB/s)", 1, 1, "⬆️", "#2ecc71")
-        self.download_card = self._create_info_card(frame, "Download Speed (KB/s)", 1, 2, "⬇️", "#f1c40f")
-        self.total_traffic_card = self._create_info_card(frame, "Total Data (MB)", 1, 3, "📦", "#9b59b6")
+        self.ping_card = self._create_info_card(frame, "Ping (Google DNS)", 1, 0, "📡", PRIMARY_COLOR_LIGHT, sub_text="Google DNS")
+        self.upload_card = self._create_info_card(frame, "Upload Speed (KB/s)", 1, 1, "⬆️", "#2ecc71", sub_text="Enviando")
+        self.download_card = self._create_info_card(frame, "Download Speed (KB/s)", 1, 2, "⬇️", "#f1c40f", sub_text="Recebendo")
+        self.total_traffic_card = self._create_info_card(frame, "Total Data (MB)", 1, 3, "📦", "#9b59b6", sub_text="Desde o Início")
         
         # Botão de Otimização de Rede
         opt_frame = ctk.CTkFrame(frame, fg_color=CARD_BACKGROUND_COLOR, corner_radius=10)
@@ -291,6 +328,35 @@ class BMarkApp(ctk.CTk):
         self.performance_result_label = ctk.CTkLabel(nvidia_frame, text="Pronto para otimizar a GPU.", text_color=GRAY_TEXT)
         self.performance_result_label.grid(row=3, column=0, padx=20, pady=(0, 10), sticky="w")
 
+        # Análise de Espaço em Disco
+        disk_frame = ctk.CTkFrame(frame, fg_color=CARD_BACKGROUND_COLOR, corner_radius=10)
+        disk_frame.grid(row=2, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
+        disk_frame.grid_columnconfigure((0, 1), weight=1)
+
+        ctk.CTkLabel(disk_frame, text="💽 Análise de Espaço em Disco", font=ctk.CTkFont(size=18, weight="bold")).grid(row=0, column=0, columnspan=2, padx=20, pady=(15, 5), sticky="w")
+        ctk.CTkLabel(disk_frame, text="Mostra as maiores pastas e arquivos. Reanálises só percorrem pastas modificadas desde a última varredura (ou indexadas há mais de 24 h).", font=ctk.CTkFont(size=12), text_color=GRAY_TEXT, wraplength=800).grid(row=1, column=0, columnspan=2, padx=20, pady=(0, 10), sticky="w")
+
+        ctk.CTkButton(disk_frame, text="Analisar Disco do Sistema", command=lambda: self._run_disk_analysis_thread(self.sys_monitor.get_system_drive()), fg_color=PRIMARY_COLOR_LIGHT, hover_color=PRIMARY_COLOR_DARK, height=40).grid(row=2, column=0, padx=(20, 10), pady=15, sticky="ew")
+        ctk.CTkButton(disk_frame, text="Analisar Pasta...", command=self._run_disk_analysis_folder, fg_color=PRIMARY_COLOR_DARK, hover_color=PRIMARY_COLOR_LIGHT, height=40).grid(row=2, column=1, padx=(10, 20), pady=15, sticky="ew")
+        self.disk_full_scan_var = ctk.BooleanVar(value=False)
+        ctk.CTkCheckBox(disk_frame, text="Reanálise completa (ignora o índice; pega arquivos que cresceram sem mudar a pasta)", variable=self.disk_full_scan_var).grid(row=3, column=0, columnspan=2, padx=20, pady=(0, 10), sticky="w")
+        self.disk_result_label = ctk.CTkLabel(disk_frame, text="Pronto para analisar.", text_color=GRAY_TEXT, justify="left", font=("Consolas", 12))
+        self.disk_result_label.grid(row=4, column=0, columnspan=2, padx=20, pady=(0, 10), sticky="w")
+
+        # Manutenção Automática (só roda com a máquina ociosa)
+        maint_frame = ctk.CTkFrame(frame, fg_color=CARD_BACKGROUND_COLOR, corner_radius=10)
+        maint_frame.grid(row=3, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
+        maint_frame.grid_columnconfigure((0, 1, 2), weight=1)
+
+        ctk.CTkLabel(maint_frame, text="🕒 Manutenção Automática (Quando Ocioso)", font=ctk.CTkFont(size=18, weight="bold")).grid(row=0, column=0, columnspan=3, padx=20, pady=(15, 5), sticky="w")
+        ctk.CTkLabel(maint_frame, text="Os jobs ficam na fila e só rodam com CPU e disco ociosos, sem jogo aberto e na tomada. Pausam assim que a carga volta.", font=ctk.CTkFont(size=12), text_color=GRAY_TEXT, wraplength=800).grid(row=1, column=0, columnspan=3, padx=20, pady=(0, 10), sticky="w")
+
+        ctk.CTkButton(maint_frame, text="Agendar Limpeza", command=self._schedule_clean, fg_color=PRIMARY_COLOR_DARK, hover_color=PRIMARY_COLOR_LIGHT).grid(row=2, column=0, padx=(20, 10), pady=15, sticky="ew")
+        ctk.CTkButton(maint_frame, text="Agendar Organização (Downloads)", command=self._schedule_organize, fg_color=PRIMARY_COLOR_DARK, hover_color=PRIMARY_COLOR_LIGHT).grid(row=2, column=1, padx=10, pady=15, sticky="ew")
+        ctk.CTkButton(maint_frame, text="Agendar Benchmark", command=self._schedule_benchmark, fg_color=PRIMARY_COLOR_DARK, hover_color=PRIMARY_COLOR_LIGHT).grid(row=2, column=2, padx=(10, 20), pady=15, sticky="ew")
+        self.maintenance_status_label = ctk.CTkLabel(maint_frame, text="Fila vazia.", text_color=GRAY_TEXT, justify="left")
+        self.maintenance_status_label.grid(row=3, column=0, columnspan=3, padx=20, pady=(0, 10), sticky="w")
+
 
     def setup_processes_frame(self):
         frame = self.frames["processes"]
@@ -306,12 +372,22 @@ class BMarkApp(ctk.CTk):
         process_list_frame.grid_rowconfigure(0, weight=1)
         
         # Listbox para mostrar processos (Usamos o CTkScrollableFrame para a lista)
-        self.process_list_container = ctk.CTkScrollableFrame(process_list_frame, label_text="Processos por Uso de Memória (Top 20)", label_font=ctk.CTkFont(size=14, weight="bold"))
+        self.process_list_container = ctk.CTkScrollableFrame(process_list_frame, label_text="Processos por Memória Real Liberável (USS; * = RSS estimado)", label_font=ctk.CTkFont(size=14, weight="bold"))
         self.process_list_container.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
         self.process_list_container.grid_columnconfigure(0, weight=1)
         
-        # Rótulos para a lista de processos
-        self.process_widgets = [] # Lista para armazenar e atualizar os rótulos de processos
+        # Rótulos para a lista de processos: criados uma vez e reaproveitados a cada atualização
+        headers = ["PID", "Nome", "Memória Real (MB)", "PSS (MB)", "CPU (%)"]
+        for col, header in enumerate(headers):
+            ctk.CTkLabel(self.process_list_container, text=header, font=ctk.CTkFont(size=12, weight="bold"), text_color=PRIMARY_COLOR_LIGHT).grid(row=0, column=col, padx=5, pady=5, sticky="w")
+        self.process_widgets = [] # Uma lista de 5 rótulos (PID, Nome, Memória, PSS, CPU) por linha
+        for row in range(1, PROCESS_LIST_ROWS + 1):
+            row_labels = []
+            for col in range(len(headers)):
+                label = ctk.CTkLabel(self.process_list_container, text="", font=("Arial", 12))
+                label.grid(row=row, column=col, padx=5, pady=2, sticky="w")
+                row_labels.append(label)
+            self.process_widgets.append(row_labels)
 
         # Opções de Processos
         options_frame = ctk.CTkFrame(frame, fg_color=CARD_BACKGROUND_COLOR, corner_radius=10)
@@ -323,8 +399,21 @@ class BMarkApp(ctk.CTk):
         
         ctk.CTkButton(options_frame, text="Encerrar Processo (PID)", command=self._run_terminate_process, fg_color=WARNING_COLOR, hover_color="#c82333").grid(row=0, column=1, padx=(10, 20), pady=15, sticky="ew")
         
+        self.process_name_entry = ctk.CTkEntry(options_frame, placeholder_text="Nome, padrão, user:<nome> ou tree:<pid> (ex: chrome*)", width=300)
+        self.process_name_entry.grid(row=1, column=0, padx=(20, 10), pady=(0, 15), sticky="w")
+        
+        ctk.CTkButton(options_frame, text="Encerrar por Nome/Padrão/Usuário/Árvore", command=self._run_terminate_by_name, fg_color=WARNING_COLOR, hover_color="#c82333").grid(row=1, column=1, padx=(10, 20), pady=(0, 15), sticky="ew")
+        
+        ctk.CTkButton(options_frame, text="➕ Adicionar à Kill List Pré-Jogo", command=self._add_to_kill_list, fg_color=PRIMARY_COLOR_DARK, hover_color=PRIMARY_COLOR_LIGHT).grid(row=2, column=0, padx=(20, 10), pady=(0, 15), sticky="ew")
+        ctk.CTkButton(options_frame, text="🎮 Executar Kill List Pré-Jogo", command=self._run_kill_list, fg_color=WARNING_COLOR, hover_color="#c82333").grid(row=2, column=1, padx=(10, 20), pady=(0, 15), sticky="ew")
+        
+        self.game_entry = ctk.CTkEntry(options_frame, placeholder_text="Jogo: nome ou PID (ex: cs2.exe)", width=300)
+        self.game_entry.grid(row=3, column=0, padx=(20, 10), pady=(0, 15), sticky="w")
+        self.game_mode_button = ctk.CTkButton(options_frame, text="🎮 Ativar Game Mode (Prioridade/Afinidade)", command=self._toggle_game_mode, fg_color=SUCCESS_COLOR, hover_color="#28a745")
+        self.game_mode_button.grid(row=3, column=1, padx=(10, 20), pady=(0, 15), sticky="ew")
+        
         self.process_status_label = ctk.CTkLabel(options_frame, text="Selecione um processo e insira o PID para encerrar.", text_color=GRAY_TEXT)
-        self.process_status_label.grid(row=1, column=0, columnspan=2, padx=20, pady=(0, 10), sticky="w")
+        self.process_status_label.grid(row=4, column=0, columnspan=2, padx=20, pady=(0, 10), sticky="w")
 
     # =======================================================================
     # --- LÓGICA DE THREADS E ATUALIZAÇÃO ---
@@ -337,28 +426,28 @@ class BMarkApp(ctk.CTk):
                 self.update_system_info()
                 self.update_network_info()
                 self.update_processes_list()
+                self.update_maintenance_status()
                 
             except Exception as e:
                 # Ocorre se o sys_monitor falhar. Ignoramos para manter a UI viva.
                 print(f"Erro no loop de atualização: {e}")
                 
-            time.sleep(3) 
+            time.sleep(UPDATE_INTERVAL_S) 
 
     def update_system_info(self):
         """Atualiza os dados de CPU, RAM, Disco e Uptime na aba Overview."""
         data = self.sys_monitor.get_overview_data()
         
-        self.cpu_card.main_value_label.configure(text=f"{data['cpu_percent']:.1f}%")
-        self.cpu_card.sub_value_label.configure(text=f"Max: {data['gpu_percent']:.1f}%") # Reutilizando gpu_percent para um sub-valor
+        self.renderer.set(self.cpu_card.main_value_label, text=f"{data['cpu_percent']:.1f}%")
+        self.renderer.set(self.cpu_card.sub_value_label, text=f"Max: {data['gpu_percent']:.1f}%") # Reutilizando gpu_percent para um sub-valor
         
-        self.ram_card.main_value_label.configure(text=f"{data['ram_percent']:.1f}%")
-        self.ram_card.sub_value_label.configure(text=data['ram_details'])
+        self.renderer.set(self.ram_card.main_value_label, text=f"{data['ram_percent']:.1f}%")
+        self.renderer.set(self.ram_card.sub_value_label, text=data['ram_details'])
         
-        self.disk_card.main_value_label.configure(text=f"{data['disk_percent']:.1f}%")
-        self.disk_card.sub_value_label.configure(text="/ (C:)") # Nome do volume
+        self.renderer.set(self.disk_card.main_value_label, text=f"{data['disk_percent']:.1f}%")
+        self.renderer.set(self.disk_card.sub_value_label, text=data['disk_label']) # Nome do volume
         
-        self.uptime_card.main_value_label.configure(text=data['uptime'])
-        self.uptime_card.sub_value_label.configure(text="Total Uptime")
+        self.renderer.set(self.uptime_card.main_value_label, text=data['uptime'])
 
     def update_network_info(self):
         """Atualiza os dados de Ping, Download e Upload na aba Network."""
@@ -366,57 +455,40 @@ class BMarkApp(ctk.CTk):
         up_kbps, down_kbps, total_mb = self.sys_monitor.get_network_speeds()
         
         ping_text = f"{ping} ms" if ping is not None else "N/A"
-        self.ping_card.main_value_label.configure(text=ping_text)
-        self.ping_card.sub_value_label.configure(text="Google DNS")
-        
-        self.upload_card.main_value_label.configure(text=f"{up_kbps:.1f} KB/s")
-        self.upload_card.sub_value_label.configure(text="Enviando")
-        
-        self.download_card.main_value_label.configure(text=f"{down_kbps:.1f} KB/s")
-        self.download_card.sub_value_label.configure(text="Recebendo")
+        self.renderer.set(self.ping_card.main_value_label, text=ping_text)
+        self.renderer.set(self.upload_card.main_value_label, text=f"{up_kbps:.1f} KB/s")
+        self.renderer.set(self.download_card.main_value_label, text=f"{down_kbps:.1f} KB/s")
+        self.renderer.set(self.total_traffic_card.main_value_label, text=f"{total_mb:.1f} MB")
 
-        self.total_traffic_card.main_value_label.configure(text=f"{total_mb:.1f} MB")
-        self.total_traffic_card.sub_value_label.configure(text="Desde o Início")
 
+    def update_maintenance_status(self):
+        """Atualiza o status da fila de manutenção na aba Performance."""
+        jobs, reason = self.maintenance.get_status()
+        if not jobs:
+            text = f"Fila vazia. ({reason})"
+        else:
+            text = "\n".join(f"• {name}: {state} ({chunks} etapas)" for name, state, chunks in jobs) + f"\nStatus: {reason}"
+        self.renderer.set(self.maintenance_status_label, text=text)
 
     def update_processes_list(self):
         """Atualiza a lista de processos na aba Processes."""
-        top_processes = self.sys_monitor.get_top_processes(limit=10)
-        
-        # Limpa widgets antigos
-        for widget in self.process_widgets:
-            widget.destroy()
-        self.process_widgets = []
-
-        # Títulos
-        headers = ["PID", "Nome", "Memória (MB)", "CPU (%)"]
-        for col, header in enumerate(headers):
-             h_label = ctk.CTkLabel(self.process_list_container, text=header, font=ctk.CTkFont(size=12, weight="bold"), text_color=PRIMARY_COLOR_LIGHT)
-             h_label.grid(row=0, column=col, padx=5, pady=5, sticky="w")
-             self.process_widgets.append(h_label)
-
-        # Adiciona novos widgets
-        for i, (name, cpu, mem_bytes, pid) in enumerate(top_processes):
-            mem_mb = mem_bytes / (1024 * 1024)
-            row = i + 1
-            
-            # PID
-            l_pid = ctk.CTkLabel(self.process_list_container, text=str(pid), font=("Arial", 12))
-            l_pid.grid(row=row, column=0, padx=5, pady=2, sticky="w")
-            
-            # Nome
-            l_name = ctk.CTkLabel(self.process_list_container, text=name, font=("Arial", 12))
-            l_name.grid(row=row, column=1, padx=5, pady=2, sticky="w")
-            
-            # Memória
-            l_mem = ctk.CTkLabel(self.process_list_container, text=f"{mem_mb:.1f}", font=("Arial", 12))
-            l_mem.grid(row=row, column=2, padx=5, pady=2, sticky="w")
-            
-            # CPU
-            l_cpu = ctk.CTkLabel(self.process_list_container, text=f"{cpu:.1f}", font=("Arial", 12))
-            l_cpu.grid(row=row, column=3, padx=5, pady=2, sticky="w")
-            
-            self.process_widgets.extend([l_pid, l_name, l_mem, l_cpu])
+        # USS amostrado em rodízio: mostra o que realmente seria liberado ao fechar o processo
+        top_processes = self.memory_analyzer.get_top_processes(limit=PROCESS_LIST_ROWS)
+        pressure = self.memory_analyzer.format_pressure(self.memory_analyzer.get_pressure())
+        self.renderer.set(self.process_list_container, label_text=f"Memória Real Liberável (USS; * = RSS estimado) | {pressure}")
+
+        # Reaproveita os rótulos fixos: só o texto que mudou é reconfigurado
+        for i, row_labels in enumerate(self.process_widgets):
+            if i < len(top_processes):
+                name, cpu, mem_bytes, pid, source, pss = top_processes[i]
+                # RSS só enquanto o USS não foi amostrado (ou sem acesso): superestima o liberável
+                mem_text = f"{mem_bytes / (1024 * 1024):.1f}" + ("" if source == 'uss' else " *")
+                pss_text = f"{pss / (1024 * 1024):.1f}" if pss is not None else "-"
+                values = [str(pid), name, mem_text, pss_text, f"{cpu:.1f}"]
+            else:
+                values = [""] * len(row_labels)
+            for label, value in zip(row_labels, values):
+                self.renderer.set(label, text=value)
 
     # =======================================================================
     # --- LÓGICA DE BOTÕES E EXECUÇÃO DE TWEAKS (THREADS) ---
@@ -426,52 +498,178 @@ class BMarkApp(ctk.CTk):
         """Wrapper para encerrar um processo por PID."""
         pid_str = self.pid_entry.get()
         if not pid_str.isdigit():
-            self.process_status_label.configure(text="⚠️ Por favor, insira um PID válido (apenas números).", text_color=WARNING_COLOR)
+            self.renderer.set(self.process_status_label, text="⚠️ Por favor, insira um PID válido (apenas números).", text_color=WARNING_COLOR)
             return
         
         pid = int(pid_str)
-        self.process_status_label.configure(text=f"Tentando encerrar PID {pid}...", text_color=GRAY_TEXT)
+        self.renderer.set(self.process_status_label, text=f"Tentando encerrar PID {pid}...", text_color=GRAY_TEXT)
         threading.Thread(target=self._execute_terminate_process_logic, args=(pid,)).start()
 
     def _execute_terminate_process_logic(self, pid):
         success, message = self.sys_monitor.terminate_process_by_pid(pid)
-        self.process_status_label.configure(text=f"🛑 {message}", text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+        self.renderer.set(self.process_status_label, text=f"🛑 {message}", text_color=SUCCESS_COLOR if success else WARNING_COLOR)
         # Força uma atualização da lista de processos após a tentativa
         self.update_processes_list()
 
 
+    def _run_terminate_by_name(self):
+        """Wrapper para encerrar em massa por nome, padrão, usuário (user:) ou árvore de processos (tree:)."""
+        query = self.process_name_entry.get().strip()
+        if not query:
+            self.renderer.set(self.process_status_label, text="⚠️ Insira um nome ou padrão de processo.", text_color=WARNING_COLOR)
+            return
+        self.renderer.set(self.process_status_label, text=f"Encerrando processos '{query}'...", text_color=GRAY_TEXT)
+        threading.Thread(target=self._execute_bulk_terminate_logic, args=(self.sys_monitor.terminate_by_name, query)).start()
+
+    def _run_kill_list(self):
+        """Wrapper para o preset Kill List Pré-Jogo."""
+        self.renderer.set(self.process_status_label, text="Executando Kill List Pré-Jogo...", text_color=GRAY_TEXT)
+        threading.Thread(target=self._execute_bulk_terminate_logic, args=(self.sys_monitor.run_kill_list,)).start()
+
+    def _execute_bulk_terminate_logic(self, action, *args):
+        success, message, _outcomes = action(*args)
+        self.renderer.set(self.process_status_label, text=f"🛑 {message}", text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+        self.update_processes_list()
+
+    def _add_to_kill_list(self):
+        query = self.process_name_entry.get().strip()
+        if not query:
+            self.renderer.set(self.process_status_label, text="⚠️ Insira um nome ou padrão para adicionar à Kill List.", text_color=WARNING_COLOR)
+            return
+        if query.lower().startswith("tree:"):
+            # PIDs mudam a cada execução: não faz sentido guardar uma árvore no preset
+            self.renderer.set(self.process_status_label, text="⚠️ A Kill List aceita nomes, padrões ou user:<nome>, não tree:<pid>.", text_color=WARNING_COLOR)
+            return
+        success, message = self.sys_monitor.save_kill_list(self.sys_monitor.load_kill_list() + [query])
+        self.renderer.set(self.process_status_label, text=f"📝 {message}", text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+
+    def _toggle_game_mode(self):
+        """Ativa/desativa o Game Mode. O jogo fica nos núcleos 1..N e o segundo plano no núcleo 0."""
+        if self.game_mode.active:
+            self.renderer.set(self.process_status_label, text="Desativando Game Mode...", text_color=GRAY_TEXT)
+            args = (None, None, None)
+        else:
+            target = self.game_entry.get().strip()
+            if not target:
+                self.renderer.set(self.process_status_label, text="⚠️ Informe o nome ou PID do jogo.", text_color=WARNING_COLOR)
+                return
+            cores = list(range(self.hardware_profile['cpu_threads'] or 1))
+            game_cores, background_cores = (cores[1:], cores[:1]) if len(cores) > 2 else (None, None)
+            self.renderer.set(self.process_status_label, text=f"Ativando Game Mode para '{target}'...", text_color=GRAY_TEXT)
+            args = (target, game_cores, background_cores)
+        # Varredura de processos e espera da thread de monitoramento não podem travar o Tk
+        self.renderer.set(self.game_mode_button, state="disabled")
+        threading.Thread(target=self._execute_game_mode_logic, args=args).start()
+
+    def _execute_game_mode_logic(self, target, game_cores, background_cores):
+        if target is None:
+            success, message = self.game_mode.deactivate()
+            self.renderer.set(self.game_mode_button, text="🎮 Ativar Game Mode (Prioridade/Afinidade)", fg_color=SUCCESS_COLOR, state="normal")
+        else:
+            success, message = self.game_mode.activate(target, game_cores=game_cores, background_cores=background_cores)
+            self.renderer.set(self.game_mode_button, text="⏹️ Desativar Game Mode", fg_color=WARNING_COLOR, state="normal")
+        self.renderer.set(self.process_status_label, text=f"🎮 {message}", text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+
     def _run_clean_thread(self):
         """Wrapper para Limpeza."""
-        self.clean_result_label.configure(text="Iniciando Limpeza... Aguarde.", text_color=GRAY_TEXT)
+        self.renderer.set(self.clean_result_label, text="Iniciando Limpeza... Aguarde.", text_color=GRAY_TEXT)
         threading.Thread(target=self._execute_clean_logic).start()
 
     def _execute_clean_logic(self):
         success, message = self.sys_tweaks.run_full_clean()
-        self.clean_result_label.configure(text=f"🧹 {message}", 
-                                           text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+        self.renderer.set(self.clean_result_label, text=f"🧹 {message}", 
+                          text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+
+    def _run_disk_analysis_folder(self):
+        path = filedialog.askdirectory(title="Pasta para analisar")
+        if path:
+            self._run_disk_analysis_thread(path)
+
+    def _run_disk_analysis_thread(self, path):
+        """Wrapper para a Análise de Espaço em Disco."""
+        self.renderer.set(self.disk_result_label, text=f"Analisando {path}... Aguarde.", text_color=GRAY_TEXT)
+        threading.Thread(target=self._execute_disk_analysis_logic, args=(path, self.disk_full_scan_var.get())).start()
+
+    def _execute_disk_analysis_logic(self, path, full):
+        try:
+            analyzer = DiskAnalyzer()
+            stats = analyzer.scan(path, full=full)
+            report = analyzer.get_report(path, limit=5)
+        except Exception as e:
+            self.renderer.set(self.disk_result_label, text=f"❌ Falha na análise: {str(e)}", text_color=WARNING_COLOR)
+            return
+        gb = 1024 ** 3
+        lines = [f"📊 {report['root']}: {report['total_bytes'] / gb:.2f} GB em {report['file_count']} arquivos "
+                 f"({stats['dirs_rescanned']}/{stats['dirs_total']} pastas relidas em {stats['elapsed_s']} s)", "", "Maiores pastas:"]
+        lines += [f"  {size / gb:8.2f} GB  {dir_path}" for size, dir_path in report['largest_dirs']]
+        lines += ["", "Maiores arquivos:"]
+        lines += [f"  {size / gb:8.2f} GB  {file_path}" for size, file_path in report['largest_files']]
+        if stats['dirs_cached']:
+            lines += ["", f"⚠️ {stats['dirs_cached']} pastas vieram do índice (até {stats['oldest_cached_s'] / 3600:.1f} h atrás): "
+                          "arquivos que cresceram sem alterar a pasta podem estar com tamanho desatualizado. Use a reanálise completa."]
+        self.renderer.set(self.disk_result_label, text="\n".join(lines), text_color=TEXT_COLOR)
+
+    def _schedule_clean(self):
+        self.maintenance.add_job("Limpeza de Temporários", self.sys_tweaks.iter_full_clean(),
+                                 on_done=lambda job: self.renderer.set(self.clean_result_label, text=f"🧹 Limpeza agendada concluída! {job.result / (1024 * 1024):.2f} MB Recuperados.", text_color=SUCCESS_COLOR))
+        self.update_maintenance_status()
+
+    def _schedule_organize(self):
+        path = os.path.join(os.path.expanduser('~'), 'Downloads')
+        self.maintenance.add_job("Organizar Downloads", self.sys_tweaks.iter_organize_folder(path),
+                                 on_done=lambda job: self.renderer.set(self.tweaks_result_label, text=f"🗂️ Organização agendada concluída! {job.result} arquivos movidos.", text_color=SUCCESS_COLOR))
+        self.update_maintenance_status()
+
+    def _schedule_benchmark(self):
+        def steps():
+            metrics, trace = self.sys_monitor.measure_latency_metrics_traced(before_tweak=self.benchmark_metrics_before is None)
+            if self.benchmark_metrics_before is None:
+                self.benchmark_metrics_before, self.benchmark_trace_before = metrics, trace
+            if self.fleet_agent: self.fleet_agent.add_benchmark(metrics, label="scheduled")
+            self.after(0, lambda: self._display_benchmark_results(metrics, before_metrics=None if self.benchmark_metrics_before is metrics else self.benchmark_metrics_before,
+                                                                  title="Resultados do Benchmark Agendado", note=self._format_trace_note(trace)))
+            yield 1
+        self.maintenance.add_job("Benchmark", steps())
+        self.update_maintenance_status()
 
     def _run_network_opt_thread(self):
         """Wrapper para Otimização de Rede."""
-        self.network_result_label.configure(text="Aplicando otimizações de Rede (Admin)...", text_color=GRAY_TEXT)
+        self.renderer.set(self.network_result_label, text="Aplicando otimizações de Rede (Admin)...", text_color=GRAY_TEXT)
         threading.Thread(target=self._execute_network_opt_logic).start()
 
     def _execute_network_opt_logic(self):
         success, message = self.sys_tweaks.run_network_optimization()
-        self.network_result_label.configure(text=f"🌐 {message}", 
-                                            text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+        self.renderer.set(self.network_result_label, text=f"🌐 {message}", 
+                          text_color=SUCCESS_COLOR if success else WARNING_COLOR)
         # Otimização de rede leva tempo para estabilizar, então esperamos
         time.sleep(5)
         self.sys_monitor.network_bytes_sent_prev = 0 # Reseta a contagem de rede para recalcular
 
     def _run_folder_org_thread(self, path):
         """Wrapper para Organização de Pasta."""
-        self.tweaks_result_label.configure(text=f"Organizando {os.path.basename(path)}...", text_color=GRAY_TEXT)
+        self.renderer.set(self.tweaks_result_label, text=f"Organizando {os.path.basename(path)}...", text_color=GRAY_TEXT)
         threading.Thread(target=self._execute_folder_org_logic, args=(path,)).start()
 
     def _execute_folder_org_logic(self, path):
         success, message = self.sys_tweaks.run_organize_folder(path)
-        self.tweaks_result_label.configure(text=f"🗂️ {message}", 
-                                            text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+        self.renderer.set(self.tweaks_result_label, text=f"🗂️ {message}", 
+                          text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+
+    def _run_find_duplicates_thread(self):
+        """Wrapper para a busca de duplicados em uma pasta escolhida."""
+        path = filedialog.askdirectory(title="Pasta para procurar duplicados")
+        if not path:
+            return
+        self.renderer.set(self.tweaks_result_label, text=f"Procurando duplicados em {os.path.basename(path) or path}...", text_color=GRAY_TEXT)
+        threading.Thread(target=self._execute_find_duplicates_logic, args=(path,)).start()
+
+    def _execute_find_duplicates_logic(self, path):
+        success, message, groups = self.sys_tweaks.run_find_duplicates(path)
+        if groups:
+            largest = groups[0]
+            message += f"\nMaior grupo: {len(largest['paths'])}x {os.path.basename(largest['paths'][0])} ({largest['reclaimable'] / (1024 * 1024):.1f} MB)"
+        self.renderer.set(self.tweaks_result_label, text=f"🔍 {message}", 
+                          text_color=SUCCESS_COLOR if success else WARNING_COLOR)
 
     # --- LÓGICA DE SEGURANÇA E BENCHMARK (JÁ ESTÃO COMPLETAS NO CÓDIGO ANTERIOR) ---
     def _update_snapshot_status(self):
@@ -480,28 +678,28 @@ class BMarkApp(ctk.CTk):
             try:
                 with open(SNAPSHOT_FILE, 'r') as f:
                     data = json.load(f)
-                self.security_status_label.configure(text=f"✅ Último Snapshot: {data['timestamp']}. Pronto para Reverter.", text_color=SUCCESS_COLOR)
+                self.renderer.set(self.security_status_label, text=f"✅ Último Snapshot: {data['timestamp']}. Pronto para Reverter.", text_color=SUCCESS_COLOR)
             except Exception:
-                self.security_status_label.configure(text="❌ Erro ao ler arquivo de Snapshot.", text_color=WARNING_COLOR)
+                self.renderer.set(self.security_status_label, text="❌ Erro ao ler arquivo de Snapshot.", text_color=WARNING_COLOR)
         else:
-            self.security_status_label.configure(text="⚠️ Nenhum Snapshot de Segurança encontrado.", text_color=WARNING_COLOR)
+            self.renderer.set(self.security_status_label, text="⚠️ Nenhum Snapshot de Segurança encontrado.", text_color=WARNING_COLOR)
 
     def _run_create_snapshot_thread(self):
-        self.security_status_label.configure(text="Criando Snapshot... Aguarde.", text_color=GRAY_TEXT)
+        self.renderer.set(self.security_status_label, text="Criando Snapshot... Aguarde.", text_color=GRAY_TEXT)
         threading.Thread(target=self._execute_create_snapshot_logic).start()
 
     def _execute_create_snapshot_logic(self):
         success, message = self.sys_tweaks.create_snapshot(self.hardware_profile)
-        self.security_status_label.configure(text=f"📸 {message}", text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+        self.renderer.set(self.security_status_label, text=f"📸 {message}", text_color=SUCCESS_COLOR if success else WARNING_COLOR)
         self._update_snapshot_status()
 
     def _run_undo_tweak_thread(self):
-        self.security_status_label.configure(text="Iniciando Reversão... Aguarde.", text_color=GRAY_TEXT)
+        self.renderer.set(self.security_status_label, text="Iniciando Reversão... Aguarde.", text_color=GRAY_TEXT)
         threading.Thread(target=self._execute_undo_tweak_logic).start()
     
     def _execute_undo_tweak_logic(self):
         success, message = self.sys_tweaks.run_undo_tweak()
-        self.security_status_label.configure(text=f"↩️ {message}", text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+        self.renderer.set(self.security_status_label, text=f"↩️ {message}", text_color=SUCCESS_COLOR if success else WARNING_COLOR)
         self._update_snapshot_status()
 
     def _run_benchmark_before(self):
@@ -510,9 +708,14 @@ class BMarkApp(ctk.CTk):
         for widget in self.result_frame.winfo_children(): widget.destroy()
         ctk.CTkLabel(self.result_frame, text="MEDINDO LATÊNCIA (ANTES)...", text_color=PRIMARY_COLOR_LIGHT, font=("Arial", 16, "bold")).grid(row=0, column=0, columnspan=3, pady=20)
         
-        # Simula o Benchmark e armazena os valores
-        self.benchmark_metrics_before = self.sys_monitor.measure_latency_metrics(before_tweak=True)
-        self._display_benchmark_results(self.benchmark_metrics_before, title="Resultados ATUAIS (ANTES dos Tweaks)")
+        threading.Thread(target=self._execute_benchmark_before_logic, daemon=True).start()
+
+    def _execute_benchmark_before_logic(self):
+        # Simula o Benchmark e armazena os valores (com trace de clock/temperatura)
+        metrics, trace = self.sys_monitor.measure_latency_metrics_traced(before_tweak=True)
+        self.benchmark_metrics_before, self.benchmark_trace_before = metrics, trace
+        if self.fleet_agent: self.fleet_agent.add_benchmark(metrics, label="before")
+        self.after(0, lambda: self._display_benchmark_results(metrics, title="Resultados ATUAIS (ANTES dos Tweaks)", note=self._format_trace_note(trace)))
 
     def _run_benchmark_after(self):
         # ... (implementação)
@@ -524,10 +727,64 @@ class BMarkApp(ctk.CTk):
         for widget in self.result_frame.winfo_children(): widget.destroy()
         ctk.CTkLabel(self.result_frame, text="MEDINDO LATÊNCIA (DEPOIS)...", text_color=PRIMARY_COLOR_LIGHT, font=("Arial", 16, "bold")).grid(row=0, column=0, columnspan=3, pady=20)
         
-        metrics_after = self.sys_monitor.measure_latency_metrics(before_tweak=False)
-        self._display_benchmark_results(metrics_after, before_metrics=self.benchmark_metrics_before, title="Resultados OTIMIZADOS (DEPOIS dos Tweaks)")
+        reference_mhz = None
+        if self.normalize_freq_var.get() and self.benchmark_trace_before:
+            reference_mhz = self.benchmark_trace_before.get('freq_avg_mhz')
+        threading.Thread(target=self._execute_benchmark_after_logic, args=(reference_mhz,), daemon=True).start()
+
+    def _execute_benchmark_after_logic(self, reference_mhz):
+        metrics_after, trace = self.sys_monitor.measure_latency_metrics_traced(before_tweak=False, reference_mhz=reference_mhz)
+        if self.fleet_agent: self.fleet_agent.add_benchmark(metrics_after, label="after")
+        note = self._format_trace_note(trace)
+        if reference_mhz:
+            note += f" | Normalizado para {reference_mhz:.0f} MHz"
+        self.after(0, lambda: self._display_benchmark_results(metrics_after, before_metrics=self.benchmark_metrics_before, title="Resultados OTIMIZADOS (DEPOIS dos Tweaks)", note=note))
+
+    def _format_trace_note(self, trace):
+        """Resumo do trace térmico para o rodapé dos resultados."""
+        freq = f"{trace['freq_avg_mhz']:.0f} MHz (variação {trace['freq_drift_pct']}%)" if trace['freq_avg_mhz'] else "clock N/D"
+        temp = f"{trace['temp_max_c']:.0f}°C máx." if trace['temp_max_c'] is not None else "temperatura N/D"
+        if trace['valid'] is None:
+            return f"ℹ️ Validade não verificável ({'; '.join(trace['reasons'])}): {freq}, {temp}."
+        if trace['valid']:
+            return f"✅ Medição válida: {freq}, {temp}. Input Lag/Frame Time simulados."
+        return f"⚠️ Medição INVÁLIDA ({'; '.join(trace['reasons'])}): {freq}, {temp}."
+
+    def _run_frametime_analysis(self):
+        """Pede a captura ANTES e, opcionalmente, a DEPOIS (diálogos separados) e analisa em segundo plano."""
+        filetypes = [("CSV", "*.csv"), ("Todos", "*.*")]
+        before_path = filedialog.askopenfilename(title="Captura ANTES (ou captura única)", filetypes=filetypes)
+        if not before_path:
+            return
+        after_path = filedialog.askopenfilename(title="Captura DEPOIS (Cancelar = analisar só a captura ANTES)", filetypes=filetypes)
+        paths = (before_path, after_path) if after_path else (before_path,)
+        for widget in self.result_frame.winfo_children(): widget.destroy()
+        ctk.CTkLabel(self.result_frame, text="ANALISANDO CAPTURA DE FRAMES...", text_color=PRIMARY_COLOR_LIGHT, font=("Arial", 16, "bold")).grid(row=0, column=0, columnspan=3, pady=20)
+        threading.Thread(target=self._execute_frametime_logic, args=(paths,), daemon=True).start()
+
+    def _execute_frametime_logic(self, paths):
+        try:
+            if len(paths) == 2:
+                result = self.frametime_analyzer.compare_captures(paths[0], paths[1])
+                before, after = result['before'], result['after']
+            else:
+                before, after = None, self.frametime_analyzer.analyze_capture(paths[0])
+            # Tamanho da captura não é métrica de desempenho: vai para a nota de rodapé
+            frames, duration = after.pop('frames'), after.pop('duration_s')
+            if before: before.pop('frames'); before.pop('duration_s')
+            note = f"{os.path.basename(paths[-1])}: {frames} frames em {duration} s (frame times reais da captura)."
+            names = [os.path.basename(p) for p in paths]
+            title = f"DEPOIS ({names[1]}) vs ANTES ({names[0]})" if before else f"Captura: {names[0]}"
+            self.after(0, lambda: self._display_benchmark_results(after, before_metrics=before, title=title, note=note))
+        except (OSError, ValueError) as e:
+            message = str(e)
+            self.after(0, lambda: self._show_benchmark_error(f"ERRO: {message}"))
+
+    def _show_benchmark_error(self, message):
+        for widget in self.result_frame.winfo_children(): widget.destroy()
+        ctk.CTkLabel(self.result_frame, text=message, text_color=WARNING_COLOR, font=("Arial", 16, "bold"), wraplength=700).grid(row=0, column=0, columnspan=3, pady=50)
 
-    def _display_benchmark_results(self, current_metrics, before_metrics=None, title="Resultados Atuais"):
+    def _display_benchmark_results(self, current_metrics, before_metrics=None, title="Resultados Atuais", note="As métricas de Latência Input/Frame Time são simuladas para demonstrar a melhoria."):
         # ... (implementação)
         for widget in self.result_frame.winfo_children(): widget.destroy()
 
@@ -549,12 +806,12 @@ class BMarkApp(ctk.CTk):
             color = GRAY_TEXT
             if before_metrics:
                 before_value = before_metrics.get(key, value)
-                if 'khz' in key: # Timer Resolution - Maior é melhor
-                    change_percent = ((value - before_value) / before_value) * 100
+                if 'khz' in key or 'fps' in key: # Timer Resolution / FPS - Maior é melhor
+                    change_percent = ((value - before_value) / before_value) * 100 if before_value else 0.0
                     if change_percent > 0: color = SUCCESS_COLOR
                     elif change_percent < 0: color = WARNING_COLOR
                 else: # Latência - Menor é melhor
-                    change_percent = ((before_value - value) / before_value) * 100
+                    change_percent = ((before_value - value) / before_value) * 100 if before_value else 0.0
                     if change_percent > 0: color = SUCCESS_COLOR
                     elif change_percent < 0: color = WARNING_COLOR 
                 
@@ -564,19 +821,22 @@ class BMarkApp(ctk.CTk):
             ctk.CTkLabel(self.result_frame, text=f"{value}{unit}", font=("Arial", 12, "bold")).grid(row=row, column=1, padx=10, pady=2, sticky="w")
             ctk.CTkLabel(self.result_frame, text=improvement, text_color=color, font=("Arial", 12, "bold")).grid(row=row, column=2, padx=10, pady=2, sticky="w")
             
-        ctk.CTkLabel(self.result_frame, text="As métricas de Latência Input/Frame Time são simuladas para demonstrar a melhoria.", text_color=GRAY_TEXT, font=("Arial", 11)).grid(row=row+1, column=0, columnspan=3, pady=(10, 5))
+        ctk.CTkLabel(self.result_frame, text=note, text_color=GRAY_TEXT, font=("Arial", 11)).grid(row=row+1, column=0, columnspan=3, pady=(10, 5))
 
     def _run_profiled_tweak(self, tweak_name):
         """Executa um tweak baseado no perfil da máquina e do usuário."""
         current_profile = self.profile_var.get()
-        self.tweaks_result_label.configure(text=f"Avaliando '{tweak_name}' para perfil '{current_profile}'...")
+        self.renderer.set(self.tweaks_result_label, text=f"Avaliando '{tweak_name}' para perfil '{current_profile}'...")
         threading.Thread(target=self._execute_profiled_tweak_logic, args=(tweak_name, current_profile)).start()
 
     def _execute_profiled_tweak_logic(self, tweak_name, current_profile):
         success, message = self.sys_tweaks.apply_tweak_based_on_profile(tweak_name, self.hardware_profile, current_profile)
-        self.tweaks_result_label.configure(text=f"🚀 {message}" if success else f"⚠️ {message}", 
-                                           text_color=SUCCESS_COLOR if success else WARNING_COLOR)
+        self.renderer.set(self.tweaks_result_label, text=f"🚀 {message}" if success else f"⚠️ {message}", 
+                          text_color=SUCCESS_COLOR if success else WARNING_COLOR)
 
     def on_closing(self):
         self.stop_event.set()
+        if self.fleet_agent: self.fleet_agent.stop()
+        self.game_mode.deactivate()
+        self.maintenance.stop()
         self.destroy()
\ No newline at end of file
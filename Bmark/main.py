@@ -1,11 +1,55 @@
 # main.py
 # (Código idêntico ao anterior)
-import customtkinter as ctk
+import os
 import platform
-from bmark_ui import BMarkApp
+import sys
+import time
+
+
+def run_headless_mode(argv):
+    """Modos sem interface: --collector [host:]porta | --agent host[:porta] (token em BMARK_FLEET_TOKEN)"""
+    from bmark_fleet import FleetAgent, FleetCollector, parse_addr, DEFAULT_COLLECTOR_HOST, FLEET_TOKEN_ENV
+
+    mode = argv[0]
+    value = argv[1] if len(argv) > 1 else None
+    token = os.environ.get(FLEET_TOKEN_ENV)
+    try:
+        host, port = parse_addr(value, DEFAULT_COLLECTOR_HOST)
+    except ValueError as e:
+        print(f"Erro: {e}")
+        sys.exit(2)
+    if mode == "--collector":
+        collector = FleetCollector(host, port, token=token)
+        port = collector.start()
+        print(f"Coletor BMark escutando em {host}:{port}. Ctrl+C para sair.")
+        if not token and host not in ("127.0.0.1", "localhost", "::1"):
+            print(f"AVISO: coletor exposto na rede sem token. Defina {FLEET_TOKEN_ENV} no coletor e nos agentes.")
+        try:
+            while True:
+                time.sleep(30)
+                for name in collector.get_hosts():
+                    print(name, collector.get_host_summary(name))
+                print("Frota (cpu_percent):", collector.get_fleet_percentiles('cpu_percent'))
+        except KeyboardInterrupt:
+            collector.stop()
+    else:
+        agent = FleetAgent(host, port, token=token)
+        agent.start()
+        print(f"Agente BMark enviando para {host}:{port}. Ctrl+C para sair.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            agent.stop()
 
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in ("--agent", "--collector"):
+        run_headless_mode(sys.argv[1:])
+        sys.exit(0)
+
+    from bmark_ui import BMarkApp
+
     if platform.system() != "Windows":
         print("AVISO: Muitos tweaks de sistema (Regedit, Debloat) são exclusivos para Windows.")
     try:
@@ -16,4 +60,4 @@ if __name__ == "__main__":
 
     app = BMarkApp()
     app.protocol("WM_DELETE_WINDOW", app.on_closing)
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
@@ -0,0 +1,6 @@
+# conftest.py
+# Os módulos do BMark são importados pelo nome (ex.: "from bmark_sysmon import ..."), como em main.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,68 @@
+# test_diskusage.py
+import os
+
+import pytest
+
+from bmark_diskusage import DiskAnalyzer
+
+
+def _write(path, size):
+    with open(path, 'wb') as f:
+        f.write(b"x" * size)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "arvore"
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "c").mkdir()
+    _write(root / "f0", 100)
+    _write(root / "a" / "f1", 1000)
+    _write(root / "a" / "b" / "f2", 5000)
+    _write(root / "c" / "f3", 200)
+    return root
+
+
+def _analyzer(tmp_path, **kwargs):
+    return DiskAnalyzer(index_file=str(tmp_path / "indice.json"), workers=2, **kwargs)
+
+
+def test_totals_include_subdirectories(tmp_path, tree):
+    analyzer = _analyzer(tmp_path)
+    analyzer.scan(str(tree))
+    report = analyzer.get_report(str(tree))
+    assert report['total_bytes'] == 6300
+    assert report['file_count'] == 4
+    assert report['largest_dirs'][0] == (6000, str(tree / "a"))
+    assert report['largest_files'][0] == (5000, str(tree / "a" / "b" / "f2"))
+
+
+def test_incremental_rescan_only_reads_modified_dirs(tmp_path, tree):
+    analyzer = _analyzer(tmp_path)
+    assert analyzer.scan(str(tree))['dirs_rescanned'] == 4
+
+    # Índice persistido: uma nova instância reaproveita tudo
+    analyzer = _analyzer(tmp_path)
+    stats = analyzer.scan(str(tree))
+    assert stats['dirs_rescanned'] == 0 and stats['dirs_cached'] == 4
+
+    _write(tree / "c" / "novo", 700) # Cria arquivo: o mtime de 'c' muda
+    stats = analyzer.scan(str(tree))
+    assert stats['dirs_rescanned'] == 1
+    assert analyzer.get_report(str(tree))['total_bytes'] == 7000
+
+
+def test_in_place_growth_needs_full_or_expired_rescan(tmp_path, tree):
+    analyzer = _analyzer(tmp_path)
+    analyzer.scan(str(tree))
+    with open(tree / "a" / "b" / "f2", 'ab') as f:
+        f.write(b"x" * 10_000) # Cresce no lugar: o mtime da pasta não muda
+
+    assert analyzer.scan(str(tree))['dirs_rescanned'] == 0
+    assert analyzer.get_report(str(tree))['total_bytes'] == 6300 # Índice desatualizado
+
+    assert analyzer.scan(str(tree), full=True)['dirs_rescanned'] == 4
+    assert analyzer.get_report(str(tree))['total_bytes'] == 16300
+
+    expired = _analyzer(tmp_path, max_age_s=0)
+    assert expired.scan(str(tree))['dirs_rescanned'] == 4
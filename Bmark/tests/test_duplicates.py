@@ -0,0 +1,72 @@
+# test_duplicates.py
+import os
+
+import pytest
+
+from bmark_duplicates import DuplicateFinder
+
+SIZE = 300_000 # Maior que 2 x PARTIAL_BLOCK: passa pelo hash parcial e pelo completo
+
+
+def _write(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+@pytest.fixture
+def finder(tmp_path):
+    return DuplicateFinder(cache_file=str(tmp_path / "cache.db"), workers=1)
+
+
+def test_hard_links_are_not_reclaimable(tmp_path, finder):
+    root = tmp_path / "dados"
+    root.mkdir()
+    data = os.urandom(SIZE)
+    _write(root / "a", data)
+    os.link(root / "a", root / "b")
+    _write(root / "c", data)
+
+    groups = finder.find_duplicates(str(root))
+
+    assert len(groups) == 1
+    assert groups[0]['paths'] == [str(root / "a"), str(root / "c")]
+    assert groups[0]['hardlinks'] == {str(root / "a"): [str(root / "b")]}
+    assert groups[0]['reclaimable'] == SIZE
+    assert finder.stats['hardlinks_skipped'] == 1
+
+
+def test_only_hard_links_is_not_a_duplicate(tmp_path, finder):
+    root = tmp_path / "dados"
+    root.mkdir()
+    _write(root / "a", os.urandom(SIZE))
+    os.link(root / "a", root / "b")
+    assert finder.find_duplicates(str(root)) == []
+
+
+def test_cache_is_reused_and_invalidated_on_change(tmp_path, finder):
+    root = tmp_path / "dados"
+    root.mkdir()
+    data = os.urandom(SIZE)
+    for name in ("a", "b", "c"):
+        _write(root / name, data)
+
+    first = finder.find_duplicates(str(root))
+    assert first[0]['reclaimable'] == 2 * SIZE
+    assert finder.stats['partial_hashed'] == 3 and finder.stats['full_hashed'] == 3
+
+    second = finder.find_duplicates(str(root))
+    assert second == first
+    assert finder.stats['partial_cached'] == 3 and finder.stats['partial_hashed'] == 0
+    assert finder.stats['full_cached'] == 3 and finder.stats['full_hashed'] == 0
+
+    # Mesmo tamanho, conteúdo diferente no meio: o mtime muda e o arquivo precisa ser hasheado de novo
+    changed = bytearray(data)
+    changed[SIZE // 2] ^= 0xFF
+    _write(root / "c", bytes(changed))
+    st = os.stat(root / "c")
+    os.utime(root / "c", ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    third = finder.find_duplicates(str(root))
+    assert finder.stats['partial_hashed'] == 1 and finder.stats['partial_cached'] == 2
+    assert finder.stats['full_hashed'] == 1 and finder.stats['full_cached'] == 2
+    assert [g['paths'] for g in third] == [[str(root / "a"), str(root / "b")]]
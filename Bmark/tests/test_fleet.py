@@ -0,0 +1,125 @@
+# test_fleet.py
+import os
+import glob
+import zlib
+
+import pytest
+
+import bmark_fleet
+from bmark_fleet import FleetAgent, FleetCollector, parse_addr, _decode_batch, _encode_batch
+
+
+@pytest.fixture
+def collector():
+    collector = FleetCollector("127.0.0.1", 0)
+    collector.start()
+    yield collector
+    collector.stop()
+
+
+def _agent(port, spool_dir):
+    return FleetAgent("127.0.0.1", port, hostname="pc-teste", spool_dir=str(spool_dir), timeout=2.0)
+
+
+def test_roundtrip_loopback(collector, tmp_path):
+    agent = _agent(collector.port, tmp_path)
+    for cpu in (10, 20, 30):
+        agent.add_sample({'cpu_percent': cpu, 'ram_percent': 50})
+    agent.add_benchmark({'timer_resolution_ms': 1.0})
+    ok, msg = agent.flush()
+    agent.stop()
+
+    assert ok, msg
+    assert collector.get_hosts() == ["pc-teste"]
+    summary = collector.get_host_summary("pc-teste")
+    assert summary['sample_count'] == 3
+    assert summary['benchmark_count'] == 1
+    assert summary['profile'] is not None
+    assert summary['cpu_percent']['avg'] == 20
+    assert collector.get_fleet_percentiles('cpu_percent')['p50'] == 20
+
+
+def test_spool_replayed_when_collector_returns(tmp_path):
+    first = FleetCollector("127.0.0.1", 0)
+    port = first.start()
+    first.stop()
+
+    agent = _agent(port, tmp_path)
+    agent.add_sample({'cpu_percent': 5})
+    ok, _ = agent.flush()
+    assert not ok
+    assert len(glob.glob(os.path.join(str(tmp_path), "batch_*.bmk"))) == 1
+    assert not glob.glob(os.path.join(str(tmp_path), "*.tmp"))
+
+    second = FleetCollector("127.0.0.1", port)
+    second.start()
+    try:
+        ok, msg = agent.flush()
+        agent.stop()
+        assert ok, msg
+        assert second.get_host_summary("pc-teste")['sample_count'] == 1
+        assert not glob.glob(os.path.join(str(tmp_path), "batch_*.bmk"))
+    finally:
+        second.stop()
+
+
+def test_corrupt_spool_file_is_quarantined(collector, tmp_path):
+    with open(tmp_path / "batch_0_000000.bmk", 'wb') as f:
+        f.write(_encode_batch({'host': 'pc-teste', 'records': []})[:5]) # Lote truncado (queda no meio da escrita)
+    agent = _agent(collector.port, tmp_path)
+    agent.add_sample({'cpu_percent': 5})
+
+    ok, msg = agent.flush()
+    agent.stop()
+
+    assert ok, msg
+    assert "recusado" in msg
+    assert os.path.exists(tmp_path / "batch_0_000000.bad")
+    assert not glob.glob(os.path.join(str(tmp_path), "batch_*.bmk"))
+    assert collector.get_host_summary("pc-teste")['sample_count'] == 1
+
+
+def test_decode_rejects_oversized_batch(monkeypatch):
+    monkeypatch.setattr(bmark_fleet, "MAX_DECODED_BYTES", 1024)
+    bomb = zlib.compress(b'{"records": "' + b"0" * 10_000 + b'"}')
+    with pytest.raises(ValueError):
+        _decode_batch(bomb)
+    assert _decode_batch(_encode_batch({'host': 'x'})) == {'host': 'x'}
+
+
+def test_parse_addr():
+    assert parse_addr("servidor", "127.0.0.1") == ("servidor", bmark_fleet.DEFAULT_FLEET_PORT)
+    assert parse_addr("servidor:9800", "127.0.0.1") == ("servidor", 9800)
+    assert parse_addr("9800", "0.0.0.0") == ("0.0.0.0", 9800)
+    with pytest.raises(ValueError):
+        parse_addr("servidor:abc", "127.0.0.1")
+
+
+def test_token_required_when_configured(tmp_path):
+    collector = FleetCollector("127.0.0.1", 0, token="segredo")
+    collector.start()
+    try:
+        intruder = FleetAgent("127.0.0.1", collector.port, hostname="pc-teste", spool_dir=str(tmp_path / "a"), timeout=2.0, token="errado")
+        intruder.add_sample({'cpu_percent': 99})
+        ok, _ = intruder.flush()
+        assert not ok
+        assert collector.get_hosts() == []
+        assert len(glob.glob(os.path.join(str(tmp_path / "a"), "batch_*.bmk"))) == 1 # Mantido para reenvio
+
+        agent = FleetAgent("127.0.0.1", collector.port, hostname="pc-teste", spool_dir=str(tmp_path / "b"), timeout=2.0, token="segredo")
+        agent.add_sample({'cpu_percent': 5})
+        ok, msg = agent.flush()
+        agent.stop()
+        intruder.stop()
+        assert ok, msg
+        assert collector.get_host_summary("pc-teste")['sample_count'] == 1
+    finally:
+        collector.stop()
+
+
+def test_benchmarks_per_host_are_bounded():
+    collector = FleetCollector(max_benchmarks_per_host=3)
+    collector.ingest({'host': 'pc', 'records': [{'type': 'benchmark', 'data': {'x': i}} for i in range(10)]})
+    summary = collector.get_host_summary('pc')
+    assert summary['benchmark_count'] == 3
+    assert summary['last_benchmark']['data'] == {'x': 9}
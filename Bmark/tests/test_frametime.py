@@ -0,0 +1,52 @@
+# test_frametime.py
+import pytest
+
+from bmark_frametime import FrameTimeAnalyzer
+
+
+def _write_capture(path, frame_times):
+    with open(path, 'w') as f:
+        f.write("Application,ProcessID,MsBetweenPresents\n")
+        for ft in frame_times:
+            f.write(f"game.exe,1234,{ft}\n")
+
+
+@pytest.mark.parametrize("chunk_lines", [37, 1000, 200_000])
+def test_known_lows_and_stutters(tmp_path, chunk_lines):
+    # 1000 frames de 10 ms com 10 picos isolados de 50 ms (um a cada 100 frames)
+    frame_times = [50.0 if i % 100 == 50 else 10.0 for i in range(1000)]
+    path = tmp_path / "captura.csv"
+    _write_capture(path, frame_times)
+
+    result = FrameTimeAnalyzer(chunk_lines=chunk_lines).analyze_capture(str(path))
+
+    assert result['frames'] == 1000
+    assert result['duration_s'] == pytest.approx(10.4)
+    assert result['avg_fps'] == pytest.approx(1000 / 10.4, abs=0.1)
+    assert result['p99_frame_time_ms'] == pytest.approx(10.0, abs=0.01)
+    assert result['p999_frame_time_ms'] == pytest.approx(50.0, abs=0.01)
+    assert result['1pct_low_fps'] == pytest.approx(100.0, abs=0.1)
+    assert result['0.1pct_low_fps'] == pytest.approx(20.0, abs=0.1)
+    assert result['max_frame_time_ms'] == 50.0
+    assert result['frame_time_variance'] == pytest.approx(15.84, abs=1e-3) # 0.99 * 0.4² + 0.01 * 39.6²
+    assert result['stutter_count'] == 10
+
+
+def test_compare_keeps_before_and_after_order(tmp_path):
+    before, after = tmp_path / "z_antes.csv", tmp_path / "a_depois.csv"
+    _write_capture(before, [20.0] * 200)
+    _write_capture(after, [10.0] * 200)
+
+    result = FrameTimeAnalyzer().compare_captures(str(before), str(after))
+
+    assert result['before']['avg_fps'] == pytest.approx(50.0)
+    assert result['after']['avg_fps'] == pytest.approx(100.0)
+    assert result['delta_percent']['avg_fps'] == pytest.approx(100.0)
+    assert result['before']['stutter_count'] == result['after']['stutter_count'] == 0
+
+
+def test_capture_without_frametime_column(tmp_path):
+    path = tmp_path / "sem_coluna.csv"
+    path.write_text("Application,ProcessID\ngame.exe,1\n")
+    with pytest.raises(ValueError):
+        FrameTimeAnalyzer().analyze_capture(str(path))
@@ -0,0 +1,72 @@
+# test_gamemode.py
+import shutil
+import platform
+import subprocess
+
+import psutil
+import pytest
+
+import bmark_gamemode
+from bmark_gamemode import GameModeManager
+
+pytestmark = pytest.mark.skipif(platform.system() != "Linux", reason="usa nice/ionice/afinidade do Linux")
+
+
+@pytest.fixture
+def background_proc(tmp_path):
+    """Processo 'sleep' comum com nome reconhecido como segundo plano (o nome vem do executável)."""
+    exe = tmp_path / "bmarkbg_sleep"
+    shutil.copy(shutil.which("sleep"), exe)
+    popen = subprocess.Popen([str(exe), "60"])
+    proc = psutil.Process(popen.pid)
+    yield proc
+    popen.kill()
+    popen.wait()
+
+
+def _snapshot(proc):
+    return proc.nice(), proc.ionice(), proc.cpu_affinity()
+
+
+def test_activate_and_deactivate_restore_background_process(background_proc):
+    before = _snapshot(background_proc)
+    manager = GameModeManager(background_rules=["bmarkbg*"], interval=60)
+    cores = [0]
+
+    manager.activate(background_proc.pid + 10**7, background_cores=cores) # Alvo inexistente: só o segundo plano muda
+    assert background_proc.ionice().ioclass == psutil.IOPRIO_CLASS_IDLE
+    assert background_proc.cpu_affinity() == cores
+    if bmark_gamemode._nice_floor() <= before[0]:
+        assert background_proc.nice() == bmark_gamemode.BACKGROUND_PRIORITY
+
+    ok, msg = manager.deactivate()
+    assert ok, msg
+    assert _snapshot(background_proc) == before
+
+
+def test_unprivileged_user_keeps_nice_and_restores_the_rest(background_proc, monkeypatch):
+    # Simula usuário comum com RLIMIT_NICE padrão: nice não poderia voltar, então nem é alterado
+    monkeypatch.setattr(bmark_gamemode, "_nice_floor", lambda: 20)
+    before = _snapshot(background_proc)
+    manager = GameModeManager(background_rules=["bmarkbg*"], interval=60)
+
+    manager.activate(background_proc.pid + 10**7, background_cores=[0])
+    assert background_proc.nice() == before[0]
+    assert background_proc.ionice().ioclass == psutil.IOPRIO_CLASS_IDLE
+
+    ok, msg = manager.deactivate()
+    assert ok, msg
+    assert _snapshot(background_proc) == before
+
+
+def test_game_process_is_targeted_by_pid(background_proc):
+    manager = GameModeManager(background_rules=["nenhum*"], interval=60)
+    before = _snapshot(background_proc)
+    cores = [0]
+
+    ok, msg = manager.activate(str(background_proc.pid), game_cores=cores)
+    assert ok, msg
+    assert background_proc.cpu_affinity() == cores
+
+    manager.deactivate()
+    assert _snapshot(background_proc) == before
@@ -0,0 +1,32 @@
+# test_memory.py
+import psutil
+
+from bmark_memory import MemoryAnalyzer
+
+
+def test_failed_samples_count_toward_tick_budget(monkeypatch):
+    analyzer = MemoryAnalyzer(samples_per_tick=3)
+    calls = []
+
+    def denied(proc):
+        calls.append(proc.pid)
+        raise psutil.AccessDenied(proc.pid)
+
+    monkeypatch.setattr(analyzer, "_sample_process", denied)
+    rows = analyzer.get_top_processes(limit=50)
+
+    assert len(calls) == 3
+    assert all(source == 'rss' and pss is None for _, _, _, _, source, pss in rows)
+
+
+def test_uss_rows_rank_ahead_of_rss_fallback(monkeypatch):
+    analyzer = MemoryAnalyzer(samples_per_tick=2)
+    monkeypatch.setattr(analyzer, "_sample_process", lambda proc: {'uss': 1, 'pss': 2, 'rss': 3})
+    rows = analyzer.get_top_processes(limit=1000)
+
+    sources = [row[4] for row in rows]
+    assert sources.count('uss') == 2
+    assert sources[:2] == ['uss', 'uss']
+    assert rows[0][5] == 2
+    rss_values = [row[2] for row in rows if row[4] == 'rss']
+    assert rss_values == sorted(rss_values, reverse=True)
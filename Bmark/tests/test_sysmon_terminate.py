@@ -0,0 +1,91 @@
+# test_sysmon_terminate.py
+import sys
+import time
+import shutil
+import platform
+import subprocess
+
+import psutil
+import pytest
+
+from bmark_sysmon import SystemMonitor
+
+pytestmark = pytest.mark.skipif(platform.system() == "Windows", reason="usa sleep e sinais POSIX")
+
+
+@pytest.fixture
+def sleeper(tmp_path):
+    """Cópia do sleep com nome próprio, para que padrões não peguem outros processos da máquina."""
+    exe = tmp_path / "bmarkkill_sleep"
+    shutil.copy(shutil.which("sleep"), exe)
+    spawned = []
+
+    def spawn(count=1):
+        procs = [subprocess.Popen([str(exe), "60"]) for _ in range(count)]
+        spawned.extend(procs)
+        return procs
+
+    yield spawn
+    for proc in spawned:
+        proc.kill()
+        proc.wait()
+
+
+def _statuses(outcomes):
+    return sorted(outcome['status'] for outcome in outcomes)
+
+
+def test_terminate_by_pattern_in_bulk(sleeper):
+    procs = sleeper(5)
+    success, message, outcomes = SystemMonitor().terminate_by_name("bmarkkill_*", timeout=2.0)
+    assert success, message
+    assert _statuses(outcomes) == ["terminated"] * 5
+    assert all(proc.wait(timeout=1) is not None for proc in procs)
+
+
+def test_escalates_to_kill_when_sigterm_is_ignored():
+    code = "import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); print('ok', flush=True); time.sleep(60)"
+    popen = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.PIPE)
+    try:
+        popen.stdout.readline() # Handler instalado
+        outcomes = SystemMonitor().terminate_processes([psutil.Process(popen.pid)], timeout=0.5)
+        assert _statuses(outcomes) == ["killed"]
+    finally:
+        popen.kill()
+        popen.wait()
+
+
+def test_terminate_tree_includes_descendants():
+    popen = subprocess.Popen(["sh", "-c", "sleep 60 & sleep 60 & wait"])
+    try:
+        parent = psutil.Process(popen.pid)
+        for _ in range(50):
+            if len(parent.children()) == 2: break
+            time.sleep(0.05)
+        children = parent.children()
+        success, message, outcomes = SystemMonitor().terminate_tree(popen.pid, timeout=2.0)
+        assert success, message
+        assert {o['pid'] for o in outcomes} == {popen.pid} | {c.pid for c in children}
+        assert not any(c.is_running() and c.status() != psutil.STATUS_ZOMBIE for c in children)
+    finally:
+        popen.kill()
+        popen.wait()
+
+
+def test_terminate_by_user_with_pattern(sleeper):
+    sleeper(2)
+    user = psutil.Process().username()
+    monitor = SystemMonitor()
+    assert len(monitor.find_processes(pattern="bmarkkill_*", username=user)) == 2
+    assert monitor.find_processes(pattern="bmarkkill_*", username="usuario-que-nao-existe") == []
+
+    success, message, outcomes = monitor.terminate_by_user(user, pattern="bmarkkill_*", timeout=2.0)
+    assert success, message
+    assert _statuses(outcomes) == ["terminated"] * 2
+
+
+def test_query_prefixes(sleeper):
+    procs = sleeper(1)
+    monitor = SystemMonitor()
+    assert [p.pid for p in monitor._select_by_query(f"tree:{procs[0].pid}")] == [procs[0].pid]
+    assert [p.pid for p in monitor._select_by_query("bmarkkill_sleep")] == [procs[0].pid]
@@ -0,0 +1,45 @@
+# test_thermal.py
+import pytest
+
+import bmark_thermal
+from bmark_thermal import ThermalTracer, normalize_to_frequency
+
+
+@pytest.fixture(autouse=True)
+def no_throttle_counter(monkeypatch):
+    monkeypatch.setattr(bmark_thermal, "_read_throttle_count", lambda: None)
+
+
+def _tracer(samples):
+    tracer = ThermalTracer(warmup_s=0.3)
+    tracer.samples = samples
+    return tracer
+
+
+def test_warmup_ramp_is_ignored():
+    # Subida 1200 -> 4000 MHz nos primeiros 0.2 s, depois clock estável com pequena variação
+    ramp = [(0.0, 1200.0, 50.0), (0.1, 2500.0, 52.0), (0.2, 3800.0, 55.0)]
+    steady = [(0.3 + i * 0.05, 4000.0 - (i % 2) * 50, 60.0) for i in range(20)]
+    summary = _tracer(ramp + steady).summary()
+    assert summary['valid'] is True
+    assert summary['samples'] == 20
+    assert summary['freq_min_mhz'] == 3950.0
+
+
+def test_throttling_after_warmup_invalidates():
+    samples = [(0.3 + i * 0.05, 4000.0 if i < 10 else 3000.0, 70.0) for i in range(20)]
+    summary = _tracer(samples).summary()
+    assert summary['valid'] is False
+    assert summary['reasons']
+
+
+def test_fixed_clock_without_sensors_is_not_verifiable():
+    samples = [(0.3 + i * 0.05, 3000.0, None) for i in range(20)]
+    summary = _tracer(samples).summary()
+    assert summary['valid'] is None
+
+
+def test_network_metrics_are_not_normalized():
+    metrics = {'input_lag_ms': 10.0, 'timer_resolution_khz': 1.0, 'network_jitter_ms': 3.0}
+    normalized = normalize_to_frequency(metrics, {'freq_avg_mhz': 2000.0}, 4000.0)
+    assert normalized == {'input_lag_ms': 5.0, 'timer_resolution_khz': 2.0, 'network_jitter_ms': 3.0}